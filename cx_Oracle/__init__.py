@@ -12,8 +12,11 @@ from custom_exceptions import Warning, Error, InterfaceError, DatabaseError, Dat
 
 from connection import Connection
 connect = Connection # the name "connect" is required by the DB API
+from session_pool import SessionPool
+from connection_pool import ConnectionPool
+from async_connection import AsyncConnection, AsyncCursor, AsyncConnectionPool
 from utils import python3_or_better
-from numbervar import NUMBER #, NATIVE_FLOAT
+from numbervar import NUMBER, NATIVE_FLOAT
 from stringvar import STRING, BINARY, FIXED_CHAR, FIXED_UNICODE, ROWID, UNICODE
 from longvar import LONG_BINARY, LONG_STRING
 from datetimevar import DATETIME
@@ -26,6 +29,14 @@ from cursorvar import CURSOR
 # compatible with cx_Oracle
 from oci import OCI_SYSDBA as SYSDBA
 from oci import OCI_SYSOPER as SYSOPER
+from oci import OCI_SPOOL_ATTRVAL_WAIT as SPOOL_ATTRVAL_WAIT
+from oci import OCI_SPOOL_ATTRVAL_NOWAIT as SPOOL_ATTRVAL_NOWAIT
+from oci import OCI_SPOOL_ATTRVAL_FORCEGET as SPOOL_ATTRVAL_FORCEGET
+from oci import ORACLE_11
+if ORACLE_11:
+    from oci import OCI_ATTR_PURITY_DEFAULT as ATTR_PURITY_DEFAULT
+    from oci import OCI_ATTR_PURITY_NEW as ATTR_PURITY_NEW
+    from oci import OCI_ATTR_PURITY_SELF as ATTR_PURITY_SELF
 
 def symbol_exists(symbol_name):
     pass
@@ -0,0 +1,306 @@
+import threading
+
+try:
+    import asyncio
+except ImportError:
+    try:
+        import trollius as asyncio
+    except ImportError:
+        asyncio = None
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+from connection import Connection
+from connection_pool import ConnectionPool
+from custom_exceptions import NotSupportedError
+
+# the number of threads of the executor shared by the connections which are not given one
+DEFAULT_MAX_WORKERS = 8
+
+default_executor = None
+default_executor_lock = threading.Lock()
+
+def get_default_executor():
+    """Return the executor shared by the connections which are not given one, creating it first if needed."""
+    global default_executor
+    with default_executor_lock:
+        if default_executor is None:
+            default_executor = ThreadPoolExecutor(DEFAULT_MAX_WORKERS)
+        return default_executor
+
+def raise_if_not_supported():
+    if asyncio is None or ThreadPoolExecutor is None:
+        raise NotSupportedError("asynchronous connections require asyncio, or trollius before Python 3.4")
+
+def ignore(value):
+    pass
+
+def chain(future, callback, result):
+    """Call the callback with the result of the future once it is done, passing errors, the callback's own
+included, on to the result future."""
+    def done(future):
+        if result.done():
+            return
+        if future.cancelled():
+            result.cancel()
+            return
+        exception = future.exception()
+        if exception is not None:
+            result.set_exception(exception)
+            return
+        try:
+            callback(future.result())
+        except Exception, e:
+            if not result.done():
+                result.set_exception(e)
+
+    future.add_done_callback(done)
+
+class AsyncConnection(object):
+    """Not cx_Oracle: a connection whose blocking calls run in an executor, so that an event loop is not blocked by
+them. The methods return futures, which are awaited with await in asyncio coroutines or with yield From() in trollius
+ones. The calls of a connection, and of its cursors, run one at a time in the order they were made. The rows fetched
+are decoded on the thread of the loop, but in turn with those calls, as decoding some types makes OCI calls with the
+error handle of the connection."""
+
+    def __init__(self, connection, loop=None, executor=None):
+        raise_if_not_supported()
+        self.connection = connection # public interface
+        self.loop = loop or asyncio.get_event_loop() # public interface
+        self.executor = executor or get_default_executor() # public interface
+
+        # completes once the call most recently queued is done
+        self.last_call = None
+
+    @staticmethod
+    def connect(*args, **kwargs):
+        """Return a future of a new asynchronous connection; the arguments are those of Connection, along with the
+loop and the executor of the asynchronous connection."""
+        raise_if_not_supported()
+        loop = kwargs.pop('loop', None) or asyncio.get_event_loop()
+        executor = kwargs.pop('executor', None) or get_default_executor()
+
+        result = asyncio.Future(loop=loop)
+        chain(loop.run_in_executor(executor, lambda: Connection(*args, **kwargs)),
+              lambda connection: result.set_result(AsyncConnection(connection, loop, executor)), result)
+        return result
+
+    def run(self, func, *args):
+        """Run the function in the executor once the calls queued before it on the connection are done, and return
+a future of its result."""
+        return self.queue(lambda: self.loop.run_in_executor(self.executor, func, *args))
+
+    def run_in_loop(self, func, *args):
+        """Run the function on the thread of the loop once the calls queued before it on the connection are done,
+and return a future of its result."""
+        def call():
+            future = asyncio.Future(loop=self.loop)
+            try:
+                future.set_result(func(*args))
+            except Exception, e:
+                future.set_exception(e)
+            return future
+
+        return self.queue(call)
+
+    def queue(self, start_call):
+        """Start the call once the calls queued before it on the connection are done, and return a future of its
+result. The call is started by a function returning a future of its result."""
+        result = asyncio.Future(loop=self.loop)
+        finished = asyncio.Future(loop=self.loop)
+        previous = self.last_call
+        self.last_call = finished
+
+        def start(ignored=None):
+            # a call cancelled while queued is not made at all
+            if result.cancelled():
+                finished.set_result(None)
+                return
+
+            try:
+                call = start_call()
+            except Exception, e:
+                finished.set_result(None)
+                result.set_exception(e)
+                return
+
+            def done(call):
+                finished.set_result(None)
+                if not result.cancelled():
+                    chain(call, result.set_result, result)
+            call.add_done_callback(done)
+
+        if previous is None or previous.done():
+            start()
+        else:
+            previous.add_done_callback(start)
+
+        return result
+
+    def cursor(self):
+        """Return a new asynchronous cursor of the connection."""
+        return AsyncCursor(self, self.connection.cursor())
+
+    def commit(self):
+        """Commit the transaction; returns a future."""
+        return self.run(self.connection.commit)
+
+    def rollback(self):
+        """Roll back the transaction; returns a future."""
+        return self.run(self.connection.rollback)
+
+    def ping(self):
+        """Make a round trip to the server; returns a future."""
+        return self.run(self.connection.ping)
+
+    def is_healthy(self):
+        """Return whether the connection looks usable, without a round trip."""
+        return self.connection.is_healthy()
+
+    def readlob(self, lob, offset=-1, amount=-1):
+        """Read from a LOB fetched on the connection; returns a future of the data."""
+        return self.run(lob.read, offset, amount)
+
+    def close(self):
+        """Close the connection; returns a future."""
+        return self.run(self.connection.close)
+
+class AsyncCursor(object):
+    """Not cx_Oracle: a cursor of an asynchronous connection. Statements are executed, and batches of rows fetched,
+in the executor, but the rows are built on the thread of the loop. The rows are iterated over by calling fetchone()
+until its future gives None, as async for needs Python 3."""
+
+    def __init__(self, connection, cursor):
+        self.connection = connection # public interface
+        self.cursor = cursor # public interface
+        self.loop = connection.loop
+
+        # the future of the fetch most recently started; fetches are done one at a time, as the next batch must not
+        # be fetched into the buffers while the rows of the current one are being built
+        self.last_fetch = None
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    def get_arraysize(self):
+        return self.cursor.arraysize
+
+    def set_arraysize(self, value):
+        self.cursor.arraysize = value
+
+    arraysize = property(get_arraysize, set_arraysize) # public interface
+
+    def execute(self, statement, *args, **kwargs):
+        """Execute the statement; returns a future."""
+        return self.connection.run(lambda: self.cursor.execute(statement, *args, **kwargs))
+
+    def executemany(self, statement, list_of_arguments, **kwargs):
+        """Execute the statement for each of the arguments; returns a future."""
+        return self.connection.run(lambda: self.cursor.executemany(statement, list_of_arguments, **kwargs))
+
+    def callproc(self, name, parameters=None, keywordParameters=None):
+        """Call a stored procedure; returns a future of the parameters."""
+        return self.connection.run(self.cursor.callproc, name, parameters, keywordParameters)
+
+    def callfunc(self, name, return_type, parameters=None, keywordParameters=None):
+        """Call a stored function; returns a future of its return value."""
+        return self.connection.run(self.cursor.callfunc, name, return_type, parameters, keywordParameters)
+
+    def fetch_rows(self, row_limit):
+        """Return a future of a list of the remaining rows, up to the given row limit if it is not 0. The rows of
+the current batch are built on the thread of the loop, in turn with the calls of the connection; the next batch is
+fetched in the executor when they run out."""
+        cursor = self.cursor
+        result = asyncio.Future(loop=self.loop)
+        previous = self.last_fetch
+        self.last_fetch = result
+        rows = []
+
+        def collect(more_rows=True):
+            while more_rows and (row_limit == 0 or len(rows) < row_limit):
+                num_rows = cursor.actual_rows - cursor.row_num
+                if num_rows <= 0:
+                    chain(self.connection.run(cursor.more_rows), decode, result)
+                    return
+
+                if row_limit:
+                    num_rows = min(num_rows, row_limit - len(rows))
+                rows.extend(cursor.create_rows(num_rows))
+
+            result.set_result(rows)
+
+        def decode(more_rows):
+            chain(self.connection.run_in_loop(collect, more_rows), ignore, result)
+
+        def verify_and_collect():
+            cursor.verify_fetch()
+            collect()
+
+        def start(ignored=None):
+            chain(self.connection.run_in_loop(verify_and_collect), ignore, result)
+
+        if previous is None or previous.done():
+            start()
+        else:
+            previous.add_done_callback(start)
+
+        return result
+
+    def fetchone(self):
+        """Fetch a single row; returns a future of the row, or of None if there are no more rows."""
+        result = asyncio.Future(loop=self.loop)
+        chain(self.fetch_rows(1), lambda rows: result.set_result(rows[0] if rows else None), result)
+        return result
+
+    def fetchmany(self, rowLimit=None):
+        """Fetch the next rows, up to the given number or the arraysize; returns a future of the list of rows."""
+        if rowLimit is None:
+            rowLimit = self.cursor.arraysize
+        return self.fetch_rows(rowLimit)
+
+    def fetchall(self):
+        """Fetch all the remaining rows; returns a future of the list of rows."""
+        return self.fetch_rows(0)
+
+    def close(self):
+        """Close the cursor; returns a future."""
+        return self.connection.run(self.cursor.close)
+
+class AsyncConnectionPool(object):
+    """Not cx_Oracle: a connection pool handing out asynchronous connections. Acquiring a connection may wait for
+one to be released, so it is done in the executor, like releasing it, which rolls back its transaction."""
+
+    def __init__(self, pool, loop=None, executor=None):
+        raise_if_not_supported()
+        if not isinstance(pool, ConnectionPool):
+            raise TypeError("expecting a connection pool")
+        self.pool = pool # public interface
+        self.loop = loop or asyncio.get_event_loop() # public interface
+        self.executor = executor or get_default_executor() # public interface
+
+    def acquire(self, timeout=None):
+        """Return a future of an asynchronous connection from the pool."""
+        result = asyncio.Future(loop=self.loop)
+        chain(self.loop.run_in_executor(self.executor, self.pool.acquire, timeout),
+              lambda connection: result.set_result(AsyncConnection(connection, self.loop, self.executor)), result)
+        return result
+
+    def release(self, connection, discard=False):
+        """Return the connection to the pool once its queued calls are done; returns a future."""
+        return connection.run(self.pool.release, connection.connection, discard)
+
+    def getmetrics(self):
+        """Return the metrics of the pool."""
+        return self.pool.getmetrics()
+
+    def close(self):
+        """Close the pool; returns a future."""
+        return self.loop.run_in_executor(self.executor, self.pool.close)
@@ -0,0 +1,98 @@
+import sys
+import threading
+
+import oci
+from pythonic_oci import OCIAttrGet
+
+class BackgroundFetch(object):
+    """Not cx_Oracle: fetches the next batch of rows of a query on a worker thread while the current batch is
+consumed. Two sets of define variables are used in turn: the cursor reads from one while Oracle fills the
+other. ctypes releases the GIL during OCIStmtFetch, so the round trip overlaps with the decoding."""
+
+    def __init__(self, environment, spare_vars):
+        self.spare_vars = spare_vars
+
+        # the worker thread reports errors through its own error handle
+        self.environment = environment.clone()
+
+        self.thread = None
+        self.row_count = None
+        self.exc_info = None
+
+    @staticmethod
+    def is_supported(cursor):
+        """Return whether the rows of the query executed by the cursor can be fetched in the background."""
+
+        # OCI calls can only be made from several threads in a threaded environment
+        if not cursor.environment.threaded:
+            return False
+
+        # LOBs and cursors are bound to the fetch that returned them, so their buffers cannot be swapped
+        for var in cursor.fetchvars:
+            if not var.type.can_be_copied:
+                return False
+
+        return True
+
+    def start(self, cursor):
+        """Start fetching the next batch of rows of the cursor into the spare variables."""
+
+        # point the defines at the spare variables
+        for pos, var in enumerate(self.spare_vars):
+            var.internal_fetch_num += 1
+            var.internal_define(cursor.handle, pos + 1)
+
+        self.row_count = None
+        self.exc_info = None
+        self.thread = threading.Thread(target=self.run, args=(cursor.handle, cursor.fetch_array_size))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self, handle, num_rows):
+        """Performs the actual fetch from Oracle; runs on the worker thread."""
+        try:
+            status = oci.OCIStmtFetch(handle, self.environment.error_handle, num_rows, oci.OCI_FETCH_NEXT,
+                                      oci.OCI_DEFAULT)
+
+            if status != oci.OCI_NO_DATA:
+                self.environment.check_for_error(status, "Cursor_InternalFetch(): fetch")
+
+            self.row_count = OCIAttrGet(handle, oci.OCI_HTYPE_STMT, oci.ub4, oci.OCI_ATTR_ROW_COUNT,
+                                        self.environment, "Cursor_InternalFetch(): row count")
+        except:
+            self.exc_info = sys.exc_info()
+
+    def wait(self):
+        """Wait for the fetch in progress to finish and return the number of rows fetched so far by the statement."""
+        self.thread.join()
+        self.thread = None
+
+        if self.exc_info is not None:
+            exc_type, exc_value, traceback = self.exc_info
+            self.exc_info = None
+            raise exc_type, exc_value, traceback
+
+        return self.row_count
+
+    def cancel(self):
+        """Wait for the fetch in progress, if any, and discard its results."""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+            self.exc_info = None
+
+    def fetch_next(self, cursor):
+        """Make the next batch of rows of the cursor current, fetching it now if it is not being fetched already.
+The cursor is not kept, to avoid a reference cycle with it."""
+        if self.thread is None:
+            self.start(cursor)
+        row_count = self.wait()
+
+        # the batch just consumed becomes the spare one
+        cursor.fetchvars, self.spare_vars = self.spare_vars, cursor.fetchvars
+        cursor.actual_rows = row_count - cursor.rowcount
+        cursor.row_num = 0
+
+        # a full batch means there may be more rows, so fetch them while this batch is consumed
+        if cursor.actual_rows == cursor.fetch_array_size:
+            self.start(cursor)
@@ -5,11 +5,11 @@ import oci
 from buffer import cxBuffer
 from environment import Environment
 from cursor import Cursor
-from custom_exceptions import Error, InterfaceError
+from custom_exceptions import Error, InterfaceError, DatabaseError, NotSupportedError
 from variable import Variable
 from stringvar import STRING, vt_String
 from utils import DRIVER_NAME
-from pythonic_oci import OCIHandleAlloc
+from pythonic_oci import OCIHandleAlloc, OCIAttrGet
 
 class Connection(object):
     def __init__(self, user=None, password=None, dsn=None, mode=None, handle=None, pool=None, threaded=True,
@@ -20,9 +20,16 @@ class Connection(object):
         self.autocommit = None
         self.inputtypehandler = None # public interface
         self.outputtypehandler = None # public interface
+        self.prefetchrows = None # public interface, not cx_Oracle: default for new cursors
+        self.prefetchmemory = None # public interface, not cx_Oracle: default for new cursors
         self.version_cache = None
+        # not cx_Oracle: the most query descriptions shared by the cursors; none by default, as changes made to the
+        # objects queried by other sessions are not seen
+        self.descriptioncachesize = 0 # public interface, not cx_Oracle
+        self.description_cache = {} # not cx_Oracle: query descriptions by statement, shared by the cursors
         self.release = False
         self.attached = False
+        self.session_pool = None
         
         self.commit_mode = oci.OCI_DEFAULT # from Connection_New
 
@@ -39,7 +46,7 @@ class Connection(object):
         if pool:
             self.environment = pool.environment.clone()
         else:
-            self.environment = Environment.new_from_scratch(threaded, events, encoding, nencoding)
+            self.environment = Environment.new_shared(threaded, events, encoding, nencoding)
         
         # treat the form user/pwd@tns
         if user and '/' in user:
@@ -52,13 +59,13 @@ class Connection(object):
         self.password = password
         self.tnsentry = self.dsn = dsn
 
-        # TODO: attach and get_connection are not implemented
+        # TODO: attach is not implemented
         if handle:
             self.attach(handle)
-        if pool or cclass:
+        elif pool or cclass:
             self.get_connection(pool, cclass, purity)
-
-        self.connect(mode, twophase, newpassword)
+        else:
+            self.connect(mode, twophase, newpassword)
 
     def connect(self, mode, twophase, newpassword):
         """Create a new connection object by connecting to the database."""
@@ -138,6 +145,10 @@ class Connection(object):
     def close(self):
         """Close the connection, disconnecting from the database."""
 
+        # sessions acquired from a pool go back to it
+        if self.release:
+            return self.release_session(oci.OCI_DEFAULT)
+
         self.rollback() # will check if we are actually connected
 
         # logoff of the server
@@ -205,8 +216,7 @@ class Connection(object):
             if self.server_handle:
                 oci.OCIServerDetach(self.server_handle, self.environment.error_handle, oci.OCI_DEFAULT)
 
-        oci.OCIHandleFree(self.environment.error_handle, oci.OCI_HTYPE_ERROR)
-        oci.OCIHandleFree(self.environment.handle, oci.OCI_HTYPE_ENV)
+        # the environment frees its own handles, except those it shares with the one it was cloned from
         self.environment = None
                 
     def commit(self):
@@ -220,6 +230,57 @@ class Connection(object):
         self.environment.check_for_error(status, "Connection_Commit()")
         self.commit_mode = oci.OCI_DEFAULT
     
+    @property
+    def stmtcachesize(self):
+        """Return the number of statements kept in the OCI statement cache of the session."""
+        self.raise_if_not_connected()
+        return OCIAttrGet(self.handle, oci.OCI_HTYPE_SVCCTX, oci.ub4, oci.OCI_ATTR_STMTCACHESIZE, self.environment,
+                          "Connection_GetStmtCacheSize()")
+
+    @stmtcachesize.setter
+    def stmtcachesize(self, value):
+        """Set the number of statements kept in the OCI statement cache of the session."""
+        self.raise_if_not_connected()
+        if not isinstance(value, (int, long)):
+            raise TypeError("value must be an integer")
+
+        c_value = oci.ub4(value)
+        status = oci.OCIAttrSet(self.handle, oci.OCI_HTYPE_SVCCTX, byref(c_value), 0, oci.OCI_ATTR_STMTCACHESIZE,
+                                self.environment.error_handle)
+        self.environment.check_for_error(status, "Connection_SetStmtCacheSize()")
+
+    def ping(self):
+        """Not cx_Oracle: make a single round trip to the server, raising an error if the connection is no longer
+usable. No cursor is involved."""
+        self.raise_if_not_connected()
+
+        if hasattr(oci, 'OCIPing'):
+            status = oci.OCIPing(self.handle, self.environment.error_handle, oci.OCI_DEFAULT)
+        else:
+            # clients older than 10.2 have no OCIPing(), but getting the server version is a round trip too
+            c_version = ctypes.create_string_buffer(512)
+            status = oci.OCIServerVersion(self.handle, self.environment.error_handle,
+                                          ctypes.cast(c_version, oci.POINTER(oci.OraText)), len(c_version),
+                                          oci.OCI_HTYPE_SVCCTX)
+        self.environment.check_for_error(status, "Connection_Ping()")
+
+    def is_healthy(self):
+        """Not cx_Oracle: return whether the connection looks usable, judging only from the state kept by the
+client, without a round trip: it must be connected, none of the errors raised for it may have meant its session was
+gone, and the OCI must not have found its server connection broken."""
+        if not self.handle or self.environment is None or self.environment.disconnect_error is not None:
+            return False
+
+        try:
+            server_handle = OCIAttrGet(self.handle, oci.OCI_HTYPE_SVCCTX, ctypes.c_void_p, oci.OCI_ATTR_SERVER,
+                                       self.environment, "Connection_IsHealthy(): get server handle")
+            server_status = OCIAttrGet(server_handle, oci.OCI_HTYPE_SERVER, oci.ub4, oci.OCI_ATTR_SERVER_STATUS,
+                                       self.environment, "Connection_IsHealthy(): get server status")
+        except DatabaseError:
+            return False
+
+        return server_status == oci.OCI_SERVER_NORMAL
+
     @property
     def maxBytesPerCharacter(self):
         """Return the maximum number of bytes per character."""
@@ -229,7 +290,81 @@ class Connection(object):
         raise NotImplementedError()
 
     def get_connection(self, pool, cclass, purity):
-        raise NotImplementedError()
+        """Create a new connection object by getting a session from the session pool or, with a connection class
+and no pool, from the database resident connection pool of the server."""
+
+        # set things up for the call to acquire a session
+        if pool:
+            db_name = pool.c_name
+            db_name_length = pool.c_name_length.value
+            mode = oci.OCI_SESSGET_SPOOL
+            if not pool.homogeneous and pool.username and self.username and self.username != pool.username:
+                mode |= oci.OCI_SESSGET_CREDPROXY
+        else:
+            buffer = cxBuffer.new_from_object(self.dsn, self.environment.encoding)
+            db_name = buffer.cast_ptr
+            db_name_length = buffer.size
+            mode = oci.OCI_SESSGET_STMTCACHE
+
+        # create authorization handle
+        auth_info = oci.POINTER(oci.OCIAuthInfo)()
+        OCIHandleAlloc(self.environment, auth_info, oci.OCI_HTYPE_AUTHINFO,
+                       "Connection_GetConnection(): allocate handle")
+        try:
+            # set the user name, if applicable
+            buffer = cxBuffer.new_from_object(self.username, self.environment.encoding)
+            if buffer.size > 0:
+                status = oci.OCIAttrSet(auth_info, oci.OCI_HTYPE_AUTHINFO, buffer.ptr, buffer.size,
+                                        oci.OCI_ATTR_USERNAME, self.environment.error_handle)
+                self.environment.check_for_error(status, "Connection_GetConnection(): set user name")
+
+            # set the password, if applicable
+            buffer = cxBuffer.new_from_object(self.password, self.environment.encoding)
+            if buffer.size > 0:
+                status = oci.OCIAttrSet(auth_info, oci.OCI_HTYPE_AUTHINFO, buffer.ptr, buffer.size,
+                                        oci.OCI_ATTR_PASSWORD, self.environment.error_handle)
+                self.environment.check_for_error(status, "Connection_GetConnection(): set password")
+
+            # set the connection class and the purity, if applicable
+            if cclass:
+                if not oci.ORACLE_11:
+                    raise NotSupportedError("connection classes require Oracle 11g or later")
+                buffer = cxBuffer.new_from_object(cclass, self.environment.encoding)
+                status = oci.OCIAttrSet(auth_info, oci.OCI_HTYPE_AUTHINFO, buffer.ptr, buffer.size,
+                                        oci.OCI_ATTR_CONNECTION_CLASS, self.environment.error_handle)
+                self.environment.check_for_error(status, "Connection_GetConnection(): set connection class")
+
+            if oci.ORACLE_11 and purity != oci.OCI_ATTR_PURITY_DEFAULT:
+                c_purity = oci.ub4(purity)
+                status = oci.OCIAttrSet(auth_info, oci.OCI_HTYPE_AUTHINFO, byref(c_purity), 0,
+                                        oci.OCI_ATTR_PURITY, self.environment.error_handle)
+                self.environment.check_for_error(status, "Connection_GetConnection(): set purity")
+
+            # acquire the new session
+            self.handle = oci.POINTER(oci.OCISvcCtx)()
+            argtypes = oci.OCISessionGet.argtypes
+            status = oci.OCISessionGet(self.environment.handle, self.environment.error_handle, byref(self.handle),
+                                       auth_info, db_name, db_name_length, argtypes[6](), 0, argtypes[8](),
+                                       argtypes[9](), argtypes[10](), mode)
+            self.environment.check_for_error(status, "Connection_GetConnection(): get connection")
+        finally:
+            oci.OCIHandleFree(auth_info, oci.OCI_HTYPE_AUTHINFO)
+
+        # the session is released, rather than ended, when the connection is closed
+        self.session_pool = pool
+        self.release = True
+
+    def release_session(self, mode):
+        """Release the session acquired by get_connection() with the given mode, rolling back any outstanding
+transaction first."""
+        self.rollback() # will check if we are actually connected
+
+        status = oci.OCISessionRelease(self.handle, self.environment.error_handle, None, 0, mode)
+        self.environment.check_for_error(status, "Connection_Release()")
+
+        self.handle = oci.POINTER(oci.OCISvcCtx)()
+        self.session_pool = None
+        self.release = False
 
     def change_password(self, password):
         raise NotImplementedError()
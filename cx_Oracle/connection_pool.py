@@ -0,0 +1,269 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from connection import Connection
+from custom_exceptions import DatabaseError, InterfaceError, OperationalError, ProgrammingError
+
+# the default number of seconds a connection may stay idle before it is checked with a round trip
+DEFAULT_PING_INTERVAL = 60
+
+class PooledConnection(object):
+    """The bookkeeping of a connection of the pool."""
+
+    def __init__(self, connection, now):
+        self.connection = connection
+        self.created = now
+        self.last_used = now
+
+class ConnectionPool(object):
+    """Not cx_Oracle: a pool of standalone connections, kept by the driver rather than by the OCI. Acquiring a
+connection waits for one to be released once max connections are open. Connections are closed once they have been
+open for maxlifetime seconds, or idle for timeout seconds while more than min are open; both are checked whenever
+connections are acquired or released, as the pool has no thread of its own. A connection idle for pinginterval seconds
+is checked with a round trip before it is handed out, and connections whose session is found to be gone are discarded
+rather than reused."""
+
+    def __init__(self, user, password, dsn, min, max, waittimeout=None, timeout=None, maxlifetime=None,
+                 pinginterval=DEFAULT_PING_INTERVAL, connectiontype=Connection, **connect_args):
+        if min < 0 or max < 1 or min > max:
+            raise ProgrammingError("pool size must satisfy 0 <= min <= max and max >= 1")
+        if not isinstance(connectiontype, type) or not issubclass(connectiontype, Connection):
+            raise ProgrammingError("connectiontype must be a subclass of Connection")
+
+        self.username = user # public interface
+        self.password = password # public interface
+        self.tnsentry = self.dsn = dsn # public interface
+        self.min = min # public interface
+        self.max = max # public interface
+        self.waittimeout = waittimeout # public interface
+        self.timeout = timeout # public interface
+        self.maxlifetime = maxlifetime # public interface
+        self.pinginterval = pinginterval # public interface
+        self.connectiontype = connectiontype # public interface
+        self.connect_args = connect_args
+        self.is_open = True
+
+        # idle connections, the most recently released last; connections being opened count as opened
+        self.idle = deque()
+        self.busy_connections = {}
+        self.num_opened = 0
+        self.condition = threading.Condition(threading.Lock())
+
+        # metrics
+        self.num_acquires = 0
+        self.num_timeouts = 0
+        self.num_created = 0
+        self.num_discarded = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_busy = 0
+
+        # open the minimum number of connections up front
+        for i in xrange(min):
+            with self.condition:
+                self.num_opened += 1
+            self.idle.append(self.open_connection())
+
+    def raise_if_not_open(self):
+        if not self.is_open:
+            raise InterfaceError("not open")
+
+    @property
+    def opened(self):
+        """Return the number of connections open, busy or idle."""
+        return self.num_opened
+
+    @property
+    def busy(self):
+        """Return the number of connections currently acquired from the pool."""
+        return len(self.busy_connections)
+
+    def open_connection(self):
+        """Open a new connection, for which a place has already been counted in the opened connections."""
+        try:
+            connection = self.connectiontype(self.username, self.password, self.dsn, **self.connect_args)
+        except:
+            with self.condition:
+                self.num_opened -= 1
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            self.num_created += 1
+        return PooledConnection(connection, time.time())
+
+    def discard(self, pooled):
+        """Close a connection which left the pool, ignoring errors since its session may be gone already."""
+        try:
+            pooled.connection.close()
+        except DatabaseError:
+            pass
+        except InterfaceError:
+            pass
+
+        with self.condition:
+            self.num_opened -= 1
+            self.num_discarded += 1
+            self.condition.notify()
+
+    def is_expired(self, pooled, now):
+        """Return whether the connection has been open for longer than its maximum lifetime."""
+        return self.maxlifetime is not None and now - pooled.created >= self.maxlifetime
+
+    def take_expired_locked(self, now):
+        """Remove from the idle connections those which have expired or been idle for too long, and return them.
+The lock must be held."""
+        expired = []
+        kept = deque()
+        num_opened = self.num_opened
+        for pooled in self.idle:
+            if self.is_expired(pooled, now):
+                expired.append(pooled)
+            elif self.timeout is not None and now - pooled.last_used >= self.timeout and \
+                    num_opened - len(expired) > self.min:
+                expired.append(pooled)
+            else:
+                kept.append(pooled)
+        self.idle = kept
+        return expired
+
+    def acquire(self, timeout=None):
+        """Return a connection from the pool, opening one if none is idle and fewer than max are open, or else waiting
+for one to be released. The timeout in seconds defaults to the waittimeout of the pool; None waits forever."""
+        self.raise_if_not_open()
+        if timeout is None:
+            timeout = self.waittimeout
+
+        start = time.time()
+        while True:
+            pooled = None
+            with self.condition:
+                while True:
+                    self.raise_if_not_open()
+                    now = time.time()
+                    expired = self.take_expired_locked(now)
+                    if expired:
+                        break
+
+                    if self.idle:
+                        pooled = self.idle.pop()
+                        break
+
+                    if self.num_opened < self.max:
+                        self.num_opened += 1
+                        break
+
+                    remaining = None
+                    if timeout is not None:
+                        remaining = start + timeout - now
+                        if remaining <= 0:
+                            self.num_timeouts += 1
+                            raise OperationalError("timed out waiting for a connection from the pool")
+                    self.condition.wait(remaining)
+
+            # connections are closed without holding the lock, as that is a round trip
+            if expired:
+                for expired_pooled in expired:
+                    self.discard(expired_pooled)
+                continue
+
+            if pooled is None:
+                pooled = self.open_connection()
+            elif not pooled.connection.is_healthy():
+                self.discard(pooled)
+                continue
+            elif self.pinginterval is not None and now - pooled.last_used >= self.pinginterval:
+                try:
+                    pooled.connection.ping()
+                except DatabaseError:
+                    self.discard(pooled)
+                    continue
+
+            break
+
+        wait_time = time.time() - start
+        with self.condition:
+            self.busy_connections[id(pooled.connection)] = pooled
+            self.num_acquires += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            self.max_busy = max(self.max_busy, len(self.busy_connections))
+
+        return pooled.connection
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool, rolling back its transaction. The connection is closed instead if asked
+to, if its session is found to be gone, if it has expired or if the pool has been closed."""
+        with self.condition:
+            pooled = self.busy_connections.pop(id(connection), None)
+        if pooled is None or pooled.connection is not connection:
+            raise ProgrammingError("connection not acquired from this pool")
+
+        if not discard and not connection.is_healthy():
+            discard = True
+
+        # errors other than those which show the session is gone are raised, after discarding the connection
+        if not discard:
+            try:
+                connection.rollback()
+            except DatabaseError:
+                discard = True
+                if connection.is_healthy():
+                    self.discard(pooled)
+                    raise
+
+        now = time.time()
+        if discard or not self.is_open or self.is_expired(pooled, now):
+            return self.discard(pooled)
+
+        pooled.last_used = now
+        with self.condition:
+            self.idle.append(pooled)
+            expired = self.take_expired_locked(now)
+            self.condition.notify()
+
+        for expired_pooled in expired:
+            self.discard(expired_pooled)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Acquire a connection for the duration of a with block, and release it afterwards."""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def getmetrics(self):
+        """Return a dictionary with the current state of the pool and the statistics of its use so far. Wait times
+are in seconds, and the utilization is the fraction of max connections that are busy."""
+        with self.condition:
+            busy = len(self.busy_connections)
+            num_acquires = self.num_acquires
+            return {
+                'opened': self.num_opened,
+                'busy': busy,
+                'idle': len(self.idle),
+                'utilization': busy / float(self.max),
+                'max_busy': self.max_busy,
+                'acquires': num_acquires,
+                'timeouts': self.num_timeouts,
+                'created': self.num_created,
+                'discarded': self.num_discarded,
+                'total_wait_time': self.total_wait_time,
+                'max_wait_time': self.max_wait_time,
+                'average_wait_time': self.total_wait_time / num_acquires if num_acquires else 0.0,
+            }
+
+    def close(self):
+        """Close the pool and its idle connections; busy connections are closed when they are released."""
+        with self.condition:
+            self.is_open = False
+            idle = list(self.idle)
+            self.idle.clear()
+            self.condition.notify_all()
+
+        for pooled in idle:
+            self.discard(pooled)
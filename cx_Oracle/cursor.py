@@ -1,5 +1,6 @@
 from ctypes import byref
 import ctypes
+import time
 
 import oci
 from pythonic_oci import OCIAttrGet, OCIParamGet, OCIHandleAlloc
@@ -11,10 +12,49 @@ from objectvar import OBJECTVAR
 from numbervar import NUMBER
 from stringvar import STRING, BINARY, FIXED_CHAR
 from datetimevar import DATETIME
+from longvar import vt_LongString, vt_LongBinary
+from lobvar import BaseLobVariableType
+from background_fetch import BackgroundFetch
+from row_builder import new_row_builder
+from lazy_row import RowBatch, LazyRow
+from error import Error
+from statement_cache import CachedStatement, StatementCache
+from dml_returning import DynamicBind
 if not python3_or_better():
     from stringvar import UNICODE, FIXED_UNICODE
 
 variable_factory = VariableFactory()
+
+# Not cx_Oracle: adaptive fetching. The define variables get as many rows as fit in the memory budget, up to a
+# maximum; between fetches the number of rows fetched at once doubles while full batches arrive quickly, and
+# halves when they are slow to arrive.
+DEFAULT_FETCH_MEMORY_BUDGET = 4 * 1024 * 1024
+ADAPTIVE_FETCH_MAX_ROWS = 32768
+ADAPTIVE_FETCH_FAST_SECONDS = 0.05
+ADAPTIVE_FETCH_SLOW_SECONDS = 0.5
+
+# Not cx_Oracle: the memory counted for each LOB value when sizing the fetches to the budget, as their contents are
+# read after the fetch rather than into the define buffers
+ADAPTIVE_FETCH_LOB_SIZE = 64 * 1024
+
+# Not cx_Oracle: the number of rows executed at once by executemany() when the rows come from an iterator
+DEFAULT_EXECUTEMANY_BATCH_SIZE = 1000
+
+# Not cx_Oracle: the most bind variable types remembered by a cursor, for all its statements
+MAX_CACHED_BIND_TYPES = 1000
+
+# Not cx_Oracle: the bind variable types which are not remembered, as later values may be short enough for another type
+UNCACHED_BIND_TYPES = (vt_LongString, vt_LongBinary)
+
+# Not cx_Oracle: the number of statements, besides the current one, a cursor keeps prepared by default; none, as
+# each of them keeps a server cursor open
+DEFAULT_STATEMENT_CACHE_SIZE = 0
+
+# statements that are prepared again even if they are identical to the previous one
+DDL_STATEMENT_TYPES = (oci.OCI_STMT_CREATE, oci.OCI_STMT_DROP, oci.OCI_STMT_ALTER)
+
+# statements which may have a returning clause
+DML_STATEMENT_TYPES = (oci.OCI_STMT_INSERT, oci.OCI_STMT_UPDATE, oci.OCI_STMT_DELETE)
     
 class Cursor(object):
     def __init__(self, connection):
@@ -25,17 +65,43 @@ class Cursor(object):
         self.fetch_array_size = 50
         self.bindarraysize = 1 # public
         self.statement_type = -1
+        self.is_returning = False
         self.output_size = -1
         self.output_size_column = -1
         self.is_open = True
+        self.is_executed = False
+        self.actual_rows = -1 # not public interface
+        self.row_num = 0
 
         self.handle = oci.POINTER(oci.OCIStmt)()
         self.statement = None # public interface
         self.input_sizes = 0
         self.numbersAsStrings = None # public interface
+        self.numbersAsNativeFloats = None # public interface, not cx_Oracle
         self.inputtypehandler = None # public interface
         self.outputtypehandler = None # public interface
         self.rowfactory = None # public interface
+        self.backgroundfetch = False # public interface, not cx_Oracle
+        self.prefetchrows = connection.prefetchrows # public interface, not cx_Oracle
+        self.prefetchmemory = connection.prefetchmemory # public interface, not cx_Oracle
+        self.prefetch_set = None
+        self.adaptivefetch = False # public interface, not cx_Oracle
+        self.fetchmemorybudget = DEFAULT_FETCH_MEMORY_BUDGET # public interface, not cx_Oracle
+        self.fetch_seconds = None
+        self.define_settings = None
+        self.row_builder = None
+        self.row_builder_rowfactory = None
+        self.lazyrows = False # public interface, not cx_Oracle
+        self.row_batch = None
+        self.row_batch_start = 0
+        self.column_indexes = None
+        self.cached_description = None
+        self.background_fetch = None
+        self.batch_errors = []
+        self.dml_row_counts = None
+        self.bind_types = {}
+        self.statementcachesize = DEFAULT_STATEMENT_CACHE_SIZE # public interface, not cx_Oracle
+        self.statement_cache = StatementCache()
         
         self.is_owned = False # WARNING: cx_Oracle doesn't initialize it
 
@@ -47,24 +113,96 @@ class Cursor(object):
 
     def free_handle(self, raise_exception):
         """Free the handle which may be reallocated if necessary."""
+        self.cancel_background_fetch()
+
         if self.handle:
             if self.is_owned:
                 status = oci.OCIHandleFree(self.handle, oci.OCI_HTYPE_STMT)
                 if raise_exception:
                     self.environment.check_for_error(status, "Cursor_FreeHandle()")
-            elif self.connection.handle:
-                try:
-                    buffer = cxBuffer.new_from_object(self.statement_tag, self.environment.encoding)
-                except:
-                    if raise_exception:
-                        raise
+            else:
+                self.release_statement(self.handle, self.statement_tag, raise_exception)
 
-                status = oci.OCIStmtRelease(self.handle, self.environment.error_handle, buffer.cast_ptr, buffer.size, oci.OCI_DEFAULT)
+            self.handle = oci.POINTER(oci.OCIStmt)()
 
-                if raise_exception:
-                    self.environment.check_for_error(status, "Cursor_FreeHandle()")
+    def release_statement(self, handle, statement_tag, raise_exception):
+        """Release a statement handle obtained from OCIStmtPrepare2(), returning it to the OCI statement cache."""
+        if not self.connection.handle:
+            return
 
-            self.handle = oci.POINTER(oci.OCIStmt)()
+        try:
+            buffer = cxBuffer.new_from_object(statement_tag, self.environment.encoding)
+        except:
+            if raise_exception:
+                raise
+            return
+
+        status = oci.OCIStmtRelease(handle, self.environment.error_handle, buffer.cast_ptr, buffer.size, oci.OCI_DEFAULT)
+
+        if raise_exception:
+            self.environment.check_for_error(status, "Cursor_FreeHandle()")
+
+    def free_statement_cache(self, raise_exception):
+        """Not cx_Oracle: release the statements cached by the cursor."""
+        for cached_statement in self.statement_cache.clear():
+            self.release_statement(cached_statement.handle, cached_statement.statement_tag, raise_exception)
+
+    def cache_statement(self):
+        """Not cx_Oracle: put the current statement in the statement cache of the cursor, with the variables defined and
+bound for it, instead of releasing it. Statements that cannot be reused as they are get released."""
+        if not self.handle or self.is_owned or self.statement is None or self.statementcachesize <= 0 or \
+                self.statement_type in DDL_STATEMENT_TYPES:
+            return self.free_handle(True)
+
+        # point the defines back at the variables in use, as rows may have been fetched into the spare ones
+        self.cancel_background_fetch()
+        if self.background_fetch is not None:
+            for pos, var in enumerate(self.fetchvars):
+                var.internal_define(self.handle, pos + 1)
+            self.background_fetch = None
+
+        cached_statement = CachedStatement(self)
+
+        # the variables given to setinputsizes() belong to the statement about to be prepared
+        if self.input_sizes:
+            cached_statement.bindvars = None
+
+        self.handle = oci.POINTER(oci.OCIStmt)()
+        for evicted_statement in self.statement_cache.put(cached_statement, self.statementcachesize):
+            self.release_statement(evicted_statement.handle, evicted_statement.statement_tag, True)
+
+    def restore_statement(self, statement, statement_tag):
+        """Not cx_Oracle: make the statement current again if it is in the statement cache of the cursor, and return
+whether it was."""
+        cached_statement = self.statement_cache.take(statement)
+        if cached_statement is None:
+            return False
+
+        if cached_statement.statement_tag != statement_tag:
+            self.release_statement(cached_statement.handle, cached_statement.statement_tag, True)
+            return False
+
+        bindvars = self.bindvars
+        cached_statement.restore(self)
+        self.is_owned = False
+        self.background_fetch = None
+        self.row_batch = None
+
+        # variables given to setinputsizes() replace those kept with the statement
+        if self.input_sizes:
+            self.bindvars = bindvars
+
+        # the variables are defined again if the settings they were defined with have changed since
+        if self.fetchvars is not None and self.define_settings != self.get_define_settings():
+            self.fetchvars = None
+            self.row_builder = None
+            self.column_indexes = None
+            self.cached_description = None
+
+        # clear row factory, if applicable
+        self.row_factory = None
+
+        return True
 
     def internal_prepare(self, statement, statement_tag):
         """Internal method for preparing a statement for execution."""
@@ -76,16 +214,21 @@ class Cursor(object):
         # nothing to do if the statement is identical to the one already stored
         # but go ahead and prepare anyway for create, alter and drop statments
         if statement is None or statement == self.statement:
-            if self.statement_type not in (oci.OCI_STMT_CREATE, oci.OCI_STMT_DROP, oci.OCI_STMT_ALTER):
+            if self.statement_type not in DDL_STATEMENT_TYPES:
                 return
             statement = self.statement
 
+        # release existing statement, if necessary; not cx_Oracle: it is kept in the statement cache if possible
+        self.cache_statement()
+
         # keep track of the statement
         self.statement = statement
-
-        # release existing statement, if necessary
         self.statement_tag = statement_tag
-        self.free_handle(True)
+        self.is_executed = False
+
+        # not cx_Oracle: a statement prepared before by the cursor is reused with its defines and binds
+        if self.restore_statement(statement, statement_tag):
+            return
 
         # prepare statement
         self.is_owned = False
@@ -104,6 +247,9 @@ class Cursor(object):
             self.handle = oci.POINTER(oci.OCIStmt)()
             raise
 
+        # the prefetch settings of the previous statement handle do not apply
+        self.prefetch_set = None
+
         # clear bind variables, if applicable
         if not self.input_sizes:
             self.bindvars = None
@@ -116,7 +262,22 @@ class Cursor(object):
 
     def get_statement_type(self):
         self.statement_type = OCIAttrGet(self.handle, oci.OCI_HTYPE_STMT, oci.ub2, oci.OCI_ATTR_STMT_TYPE, self.environment, "Cursor_GetStatementType()")
+
+        # not cx_Oracle: executemany() binds the variables of DML returning statements dynamically, so that the values
+        # returned for each row are collected; clients which cannot tell are treated as never returning
+        self.is_returning = False
+        if self.statement_type in DML_STATEMENT_TYPES:
+            try:
+                self.is_returning = bool(OCIAttrGet(self.handle, oci.OCI_HTYPE_STMT, oci.ub1,
+                                                    oci.OCI_ATTR_STMT_IS_RETURNING, self.environment,
+                                                    "Cursor_GetStatementType(): is returning"))
+            except DatabaseError:
+                pass
         self.fetchvars = None
+        self.background_fetch = None
+        self.row_builder = None
+        self.column_indexes = None
+        self.cached_description = None
 
     def perform_define(self):
 
@@ -125,25 +286,160 @@ class Cursor(object):
 
         # create a list corresponding to the number of items
         self.fetchvars = [None] * num_params # or should I use appends?
+        self.row_builder = None
+        self.column_indexes = None
+        self.define_settings = self.get_define_settings()
+
+        # define a variable for each select-item; for adaptive fetching, a single row is enough at first since
+        # the variables are only used to learn how wide the rows are
+        if self.adaptivefetch:
+            self.fetch_array_size = 1
+        else:
+            self.fetch_array_size = self.arraysize
 
-        # define a variable for each select-item
-        self.fetch_array_size = self.arraysize
+        # not cx_Oracle: the description of the query is gathered from the parameter descriptors used for the
+        # defines, unless the connection has it already for the same columns
+        connection_description = self.get_connection_description(num_params)
+        description = []
         for pos in xrange(1, num_params+1):
-            var = variable_factory.define(self, self.fetch_array_size, pos)
+            param = OCIParamGet(self.handle, oci.OCI_HTYPE_STMT, self.environment, pos, "Variable_Define(): parameter")
+            try:
+                var = variable_factory.define_helper(self, param, pos, self.fetch_array_size)
+                if connection_description is None:
+                    description.append(self.get_item_description_helper(pos, param))
+            finally:
+                oci.OCIDescriptorFree(param, oci.OCI_DTYPE_PARAM)
             self.fetchvars[pos - 1] = var
 
-    def internal_execute(self, num_iters):
+        self.set_description(connection_description, description)
+
+        if self.adaptivefetch:
+            self.define_for_memory_budget()
+
+    def get_define_settings(self):
+        """Not cx_Oracle: return the settings of the cursor which the variables defined for a query depend on."""
+        return (self.outputtypehandler, self.connection.outputtypehandler, self.numbersAsStrings,
+                self.numbersAsNativeFloats, self.arraysize, self.adaptivefetch, self.fetchmemorybudget, self.lazyrows)
+
+    def get_connection_description(self, num_params):
+        """Not cx_Oracle: return the description the connection has for the statement, if it caches descriptions and
+has one with as many columns."""
+        if self.statement is None or self.connection.descriptioncachesize <= 0:
+            return None
+
+        cached = self.connection.description_cache.get(self.statement)
+        if cached is None or len(cached[1]) != num_params:
+            return None
+
+        return cached
+
+    def set_description(self, connection_description, description):
+        """Not cx_Oracle: make the description of the query the one kept for the statement, and the one cached by the
+connection if it caches descriptions. The description the connection has for the statement is only used if the
+columns were defined with the same variable types as when it was cached; otherwise the columns are described again."""
+        var_types = tuple([var and var.type for var in self.fetchvars])
+        if connection_description is not None:
+            cached_var_types, description = connection_description
+            if cached_var_types != var_types:
+                description = [self.get_item_description(pos) for pos in xrange(1, len(self.fetchvars) + 1)]
+
+        self.cached_description = description
+        cache_size = self.connection.descriptioncachesize
+        if self.statement is not None and cache_size > 0:
+            description_cache = self.connection.description_cache
+            if len(description_cache) >= cache_size:
+                description_cache.clear()
+            description_cache[self.statement] = var_types, description
+
+    def define_for_memory_budget(self):
+        """Define the variables again, for as many rows as fit in the memory budget of the cursor. Queries with
+columns whose values are not in the define buffers, such as LOBs, fetch at most arraysize rows at once, as each of
+their elements holds a descriptor or handle which is allocated and checked before every fetch."""
+
+        # determine the memory needed for each row; the buffers of LONG columns hold their whole values already
+        row_size = 0
+        max_rows = ADAPTIVE_FETCH_MAX_ROWS
+        for var in self.fetchvars:
+            row_size += var.bufferSize + ctypes.sizeof(oci.sb2)
+            if var.type.is_variable_length:
+                row_size += 2 * ctypes.sizeof(oci.ub2)
+            if isinstance(var.type, BaseLobVariableType):
+                row_size += ADAPTIVE_FETCH_LOB_SIZE
+            if not var.type.values_in_buffers:
+                max_rows = min(max_rows, self.arraysize)
+
+        num_rows = max(1, min(self.fetchmemorybudget // row_size, max_rows))
+        for pos, var in enumerate(self.fetchvars):
+            var = self.new_fetch_variable(var, num_rows)
+            var.internal_define(self.handle, pos + 1)
+            self.fetchvars[pos] = var
+
+        # start from the array size, which later fetches adapt
+        self.fetch_array_size = min(self.arraysize, num_rows)
+
+    def new_fetch_variable(self, var, num_elements):
+        """Return a new variable for fetching the same column as the given one, with room for num_elements rows."""
+        new_var = variable_factory.new(self, num_elements, var.type, var.size)
+        new_var.outconverter = var.outconverter
+        return new_var
+
+    def setup_background_fetch(self):
+        """Start or stop fetching rows in the background, as requested by the backgroundfetch attribute."""
+        if not self.backgroundfetch:
+            if self.background_fetch is not None:
+                self.background_fetch = None
+
+                # point the defines back at the variables in use
+                for pos, var in enumerate(self.fetchvars):
+                    var.internal_define(self.handle, pos + 1)
+
+            return
+
+        if self.background_fetch is None and BackgroundFetch.is_supported(self):
+            spare_vars = [self.new_fetch_variable(var, var.allocelems) for var in self.fetchvars]
+
+            self.background_fetch = BackgroundFetch(self.environment, spare_vars)
+
+    def cancel_background_fetch(self):
+        """Wait for the rows being fetched in the background, if any, and discard them."""
+        if self.background_fetch is not None:
+            self.background_fetch.cancel()
+
+    def internal_execute(self, num_iters, mode=oci.OCI_DEFAULT, row_offset=0):
         """Perform the work of executing a cursor and set the rowcount appropriately
-           regardless of whether an error takes place."""
+           regardless of whether an error takes place. Not cx_Oracle: the mode is combined with the commit mode, and
+           the row offset is the position of the first row executed among all those of the executemany() call."""
+
+        # the statement cannot be executed while rows are being fetched from it
+        self.cancel_background_fetch()
 
         if self.connection.autocommit:
-            mode = oci.OCI_COMMIT_ON_SUCCESS
-        else:   
-            mode = oci.OCI_DEFAULT
+            mode |= oci.OCI_COMMIT_ON_SUCCESS
+
+        # not cx_Oracle: the variables bound dynamically are reachable from their callbacks only while executing
+        dynamic_vars = self.get_dynamic_bind_variables()
+        for var in dynamic_vars:
+            var.dynamic_bind.start(var, row_offset)
 
         argtypes = oci.OCIStmtExecute.argtypes
-        status = oci.OCIStmtExecute(self.connection.handle, self.handle, self.environment.error_handle, num_iters, 0, argtypes[5](), argtypes[6](), mode)
-        # here the OCI will change variable.c_actual_elements, given at bind time
+        try:
+            status = oci.OCIStmtExecute(self.connection.handle, self.handle, self.environment.error_handle, num_iters, 0, argtypes[5](), argtypes[6](), mode)
+            # here the OCI will change variable.c_actual_elements, given at bind time
+        finally:
+            callback_exc_info = None
+            for var in dynamic_vars:
+                exc_info = var.dynamic_bind.finish()
+                if callback_exc_info is None:
+                    callback_exc_info = exc_info
+
+        # an error raised in a callback is the reason the execution failed
+        if callback_exc_info is not None:
+            try:
+                self.set_row_count()
+            except:
+                pass
+            exc_type, exc_value, traceback = callback_exc_info
+            raise exc_type, exc_value, traceback
         
         try:
             self.environment.check_for_error(status, "Cursor_InternalExecute()")
@@ -189,7 +485,7 @@ class Cursor(object):
                 else:
                     orig_var = None
                 
-                new_var = self.set_bind_variable_helper(num_elements, array_pos, value, orig_var, defer_type_assignment)
+                new_var = self.set_bind_variable_helper(num_elements, array_pos, value, orig_var, defer_type_assignment, i)
 
                 if new_var:
                     if i < len(self.bindvars):
@@ -201,13 +497,13 @@ class Cursor(object):
         else:
             for key, value in parameters.iteritems():
                 orig_var = self.bindvars.get(key, None)
-                new_var = self.set_bind_variable_helper(num_elements, array_pos, value, orig_var, defer_type_assignment)
+                new_var = self.set_bind_variable_helper(num_elements, array_pos, value, orig_var, defer_type_assignment, key)
                 
                 if new_var:
                     self.bindvars[key] = new_var
 
-    def set_bind_variable_helper(self, num_elements, array_pos, value, orig_var, defer_type_assignment):
-        """Helper for setting a bind variable."""
+    def set_bind_variable_helper(self, num_elements, array_pos, value, orig_var, defer_type_assignment, key):
+        """Helper for setting a bind variable. Not cx_Oracle: the key is the position or name of the bind variable."""
         from variable import Variable 
         # initialization
         new_var = None 
@@ -256,11 +552,41 @@ class Cursor(object):
             # otherwise, create a new variable, unless the value is None and
             # we wish to defer type assignment
             elif value is not None or not defer_type_assignment:
-                new_var = variable_factory.new_by_value(self, value, num_elements)
+                new_var = self.new_bind_variable(key, value, num_elements)
                 new_var.set_value(array_pos, value)
 
         return new_var
 
+    def new_bind_variable(self, key, value, num_elements):
+        """Not cx_Oracle: create a variable for binding the value at the given position or name of the statement. The
+type inferred from the value is remembered for the statement, so that the variables created for values of the same
+type bound there later on, after other statements were executed, skip the inference."""
+
+        # input type handlers and arrays always decide for themselves
+        if value is None or isinstance(value, list) or self.inputtypehandler is not None or \
+                self.connection.inputtypehandler is not None:
+            return variable_factory.new_by_value(self, value, num_elements)
+
+        cache_key = self.statement, key
+        python_type = value.__class__
+        cached = self.bind_types.get(cache_key)
+        if cached is not None and cached[0] is python_type:
+            var_type, size = cached[1:]
+
+            # values with a size reuse the variable type if they fit the size it was inferred for
+            if size is None or len(value) <= size:
+                return variable_factory.new(self, num_elements, var_type, size)
+
+        var_type, size, _ = variable_factory.type_by_value(value)
+        if var_type in UNCACHED_BIND_TYPES:
+            self.bind_types.pop(cache_key, None)
+        else:
+            if len(self.bind_types) >= MAX_CACHED_BIND_TYPES:
+                self.bind_types.clear()
+            self.bind_types[cache_key] = python_type, var_type, size
+
+        return variable_factory.new(self, num_elements, var_type, size)
+
 
     def execute(self, statement, *args, **kwargs):
         """Execute the statement."""
@@ -294,16 +620,25 @@ class Cursor(object):
         # execute the statement
         is_query = self.statement_type == oci.OCI_STMT_SELECT
         if is_query:
+            self.set_prefetch()
             num_iters = 0
         else:
             num_iters = 1
 
         self.internal_execute(num_iters)
+
+        # not cx_Oracle: the descriptions of queries may change with the definition of the objects they use
+        if self.statement_type in DDL_STATEMENT_TYPES:
+            self.connection.description_cache.clear()
         
         # perform defines, if necessary
         if is_query and self.fetchvars is None:
             self.perform_define()
 
+        # fetch rows in the background, if requested
+        if is_query:
+            self.setup_background_fetch()
+
         # reset the values of setoutputsize()
         self.output_size = -1
         self.output_size_column = -1
@@ -324,9 +659,48 @@ class Cursor(object):
         # prepare the statement
         self.internal_prepare(statement, statement_tag)
 
-    def executemany(self, statement, list_of_arguments):
+    def parse(self, statement):
+        """Parse the statement without executing it. Queries are described as well: their variables are defined and
+their description is available, but they are not run and no rows are fetched."""
+
+        # make sure the cursor is open
+        self.raise_if_not_open()
+
+        # prepare the statement
+        self.internal_prepare(statement, None)
+
+        # the rows of an earlier execution of the statement are not fetched after parsing it
+        self.is_executed = False
+
+        # not cx_Oracle: a query defined already, as one kept in the statement cache, is described already
+        is_query = self.statement_type == oci.OCI_STMT_SELECT
+        if is_query and self.fetchvars is not None:
+            return
+
+        if is_query:
+            mode = oci.OCI_DESCRIBE_ONLY
+        else:
+            mode = oci.OCI_PARSE_ONLY
+
+        argtypes = oci.OCIStmtExecute.argtypes
+        status = oci.OCIStmtExecute(self.connection.handle, self.handle, self.environment.error_handle, 0, 0,
+                                    argtypes[5](), argtypes[6](), mode)
+        try:
+            self.environment.check_for_error(status, "Cursor_Parse()")
+        except Exception, e:
+            raise self.set_error_offset(e)
+
+        # perform defines
+        if is_query:
+            self.perform_define()
+
+    def executemany(self, statement, list_of_arguments, batchsize=None, batcherrors=False, arraydmlrowcounts=False):
         """Execute the statement many times. The number of times is equivalent to the number of elements in the array 
-of dictionaries."""
+of dictionaries. Not cx_Oracle: if a batch size is given, or the arguments come from an iterator without a length,
+the rows are executed in batches of that many rows (by default 1000), reusing the same bind variables.
+With batcherrors, the rows that fail do not stop the others from being executed; their errors are returned by
+getbatcherrors(). With arraydmlrowcounts, the number of rows affected by each row of arguments is returned by
+getarraydmlrowcounts()."""
         # make sure the cursor is open - ctypes: prepare already checks that
         # self.raise_if_not_open()
 
@@ -337,6 +711,25 @@ of dictionaries."""
         if self.statement_type == oci.OCI_STMT_SELECT:
             raise NotSupportedError("queries not supported: results undefined")
 
+        mode = oci.OCI_DEFAULT
+        self.batch_errors = []
+        self.dml_row_counts = None
+        if batcherrors:
+            mode |= oci.OCI_BATCH_ERRORS
+        if arraydmlrowcounts:
+            if not oci.ORACLE_12:
+                raise NotSupportedError("array DML row counts require Oracle 12 or later")
+            mode |= oci.OCI_RETURN_ROW_COUNT_ARRAY
+            self.dml_row_counts = []
+
+        if batchsize is not None or not hasattr(list_of_arguments, "__len__"):
+            if batchsize is None:
+                batchsize = DEFAULT_EXECUTEMANY_BATCH_SIZE
+            elif batchsize < 1:
+                raise ValueError("batchsize must be positive")
+
+            return self.executemany_in_batches(list_of_arguments, batchsize, mode)
+
         # perform binds
         num_rows = len(list_of_arguments)
         for i, arguments in enumerate(list_of_arguments):
@@ -344,10 +737,188 @@ of dictionaries."""
                 raise InterfaceError("expecting a list of dictionaries or sequences")
             self.set_bind_variables(arguments, num_rows, i, (i < num_rows - 1))
 
-        self.perform_bind()
+        self.perform_bind(self.is_returning)
 
         # execute the statement, but only if the number of rows is greater than zero since Oracle raises an error 
         # otherwise
+        if num_rows > 0:
+            self.internal_execute(num_rows, mode)
+            self.get_array_dml_results(mode, 0)
+
+    def set_prefetch(self):
+        """Set the number of rows and the amount of memory prefetched by the OCI when a query is executed."""
+        prefetch_rows = self.prefetchrows
+        if prefetch_rows is None:
+            # prefetching one row more than the first fetch asks for returns it with the execute, and tells
+            # whether the query is done too, so small queries need no further round trip
+            if self.fetchvars is None:
+                prefetch_rows = self.arraysize + 1
+            else:
+                prefetch_rows = self.fetch_array_size + 1
+
+        # zero leaves the prefetch limited by rows only, which is the OCI default
+        prefetch_memory = self.prefetchmemory
+        if prefetch_memory is None:
+            prefetch_memory = 0
+
+        # nothing to do if the statement handle already has these settings
+        prefetch = prefetch_rows, prefetch_memory
+        if prefetch == self.prefetch_set:
+            return
+
+        c_prefetch_rows = oci.ub4(prefetch_rows)
+        status = oci.OCIAttrSet(self.handle, oci.OCI_HTYPE_STMT, byref(c_prefetch_rows), 0,
+                                oci.OCI_ATTR_PREFETCH_ROWS, self.environment.error_handle)
+        self.environment.check_for_error(status, "Cursor_SetPrefetch(): rows")
+
+        c_prefetch_memory = oci.ub4(prefetch_memory)
+        status = oci.OCIAttrSet(self.handle, oci.OCI_HTYPE_STMT, byref(c_prefetch_memory), 0,
+                                oci.OCI_ATTR_PREFETCH_MEMORY, self.environment.error_handle)
+        self.environment.check_for_error(status, "Cursor_SetPrefetch(): memory")
+
+        self.prefetch_set = prefetch
+
+    def executemany_in_batches(self, list_of_arguments, batchsize, mode):
+        """Execute the prepared statement for each of the arguments, batchsize rows at a time. The rowcount is the total
+of all the batches, and the batch errors and row counts are collected for all of them."""
+        end = object()
+        total_row_count = 0
+        rows_executed = 0
+
+        # the next arguments are looked up in advance: type assignment is deferred for all but the last row of a batch,
+        # as executemany() does for all but the last row
+        iterator = iter(list_of_arguments)
+        next_arguments = next(iterator, end)
+        array_pos = 0
+        while next_arguments is not end:
+            arguments = next_arguments
+            next_arguments = next(iterator, end)
+            is_last_in_batch = next_arguments is end or array_pos == batchsize - 1
+
+            if not isinstance(arguments, dict) and not is_sequence(arguments):
+                raise InterfaceError("expecting a list of dictionaries or sequences")
+            self.set_bind_variables(arguments, batchsize, array_pos, not is_last_in_batch)
+            array_pos += 1
+
+            # execute the batch once it is full or the arguments are exhausted
+            if is_last_in_batch:
+                self.perform_bind(self.is_returning)
+                self.rowcount = 0
+                try:
+                    self.internal_execute(array_pos, mode, rows_executed)
+                finally:
+                    total_row_count += self.rowcount
+                    self.rowcount = total_row_count
+                self.get_array_dml_results(mode, rows_executed)
+                rows_executed += array_pos
+                array_pos = 0
+
+        self.rowcount = total_row_count
+
+    def get_array_dml_results(self, mode, row_offset):
+        """Collect the batch errors and the row counts of an array DML execution, if its mode asked for them. The row
+offset is the position of the first row executed among all those of the executemany() call."""
+        if mode & oci.OCI_BATCH_ERRORS:
+            num_errors = OCIAttrGet(self.handle, oci.OCI_HTYPE_STMT, oci.ub4, oci.OCI_ATTR_NUM_DML_ERRORS,
+                                    self.environment, "Cursor_GetBatchErrors(): number of errors")
+            if num_errors > 0:
+                # each error is retrieved into an error handle of its own
+                error_handle = ctypes.c_void_p()
+                OCIHandleAlloc(self.environment, error_handle, oci.OCI_HTYPE_ERROR,
+                               "Cursor_GetBatchErrors(): allocate error handle")
+                try:
+                    for i in xrange(num_errors):
+                        status = oci.OCIParamGet(self.environment.error_handle, oci.OCI_HTYPE_ERROR,
+                                                 self.environment.error_handle, byref(error_handle), i)
+                        self.environment.check_for_error(status, "Cursor_GetBatchErrors(): get error handle")
+
+                        row_error_handle = ctypes.cast(error_handle, oci.POINTER(oci.OCIError))
+                        offset = OCIAttrGet(row_error_handle, oci.OCI_HTYPE_ERROR, oci.ub4,
+                                            oci.OCI_ATTR_DML_ROW_OFFSET, self.environment,
+                                            "Cursor_GetBatchErrors(): row offset")
+                        error = Error(self.environment, "Cursor_GetBatchErrors()", True, row_error_handle)
+                        error.offset = row_offset + offset
+                        self.batch_errors.append(error)
+                finally:
+                    oci.OCIHandleFree(error_handle, oci.OCI_HTYPE_ERROR)
+
+        # OCI_RETURN_ROW_COUNT_ARRAY is only defined by the Oracle 12 headers
+        if self.dml_row_counts is not None:
+            c_row_counts = oci.POINTER(oci.ub8)()
+            c_num_row_counts = oci.ub4()
+            status = oci.OCIAttrGet(self.handle, oci.OCI_HTYPE_STMT, byref(c_row_counts), byref(c_num_row_counts),
+                                    oci.OCI_ATTR_DML_ROW_COUNT_ARRAY, self.environment.error_handle)
+            self.environment.check_for_error(status, "Cursor_GetArrayDMLRowCounts()")
+            self.dml_row_counts.extend(c_row_counts[:c_num_row_counts.value])
+
+    def getbatcherrors(self):
+        """Return the errors of the rows that failed during the last executemany() with batcherrors. The offset of
+each error is the position of its row in the arguments."""
+        self.raise_if_not_open()
+        return list(self.batch_errors)
+
+    def getarraydmlrowcounts(self):
+        """Return the number of rows affected by each row of arguments of the last executemany() with
+arraydmlrowcounts."""
+        self.raise_if_not_open()
+        if self.dml_row_counts is None:
+            raise InterfaceError("array DML row counts not enabled")
+        return list(self.dml_row_counts)
+
+    def executemany_columns(self, statement, columns):
+        """Not cx_Oracle: execute the statement once for each row of the given columns, which are either a sequence with
+one sequence of values per positional bind variable or a dictionary with one per bind variable name. Each column
+is typed once and copied into its bind variable in a single pass."""
+
+        # prepare the statement
+        self.prepare(statement, None)
+
+        # queries are not supported as the result is undefined
+        if self.statement_type == oci.OCI_STMT_SELECT:
+            raise NotSupportedError("queries not supported: results undefined")
+
+        bound_by_pos = is_sequence(columns)
+        if bound_by_pos:
+            items = list(enumerate(columns))
+        elif isinstance(columns, dict):
+            items = columns.items()
+        else:
+            raise TypeError("expecting a dictionary or sequence of columns")
+
+        # all columns must have the same number of rows
+        num_rows = 0
+        if items:
+            num_rows = len(items[0][1])
+        for key, values in items:
+            if len(values) != num_rows:
+                raise ProgrammingError("columns must have the same number of rows")
+
+        # create the bind variables, keeping those specified with setinputsizes()
+        if bound_by_pos:
+            bindvars = [None] * len(items)
+        else:
+            bindvars = {}
+        for key, values in items:
+            var = None
+            if self.input_sizes and self.bindvars:
+                try:
+                    var = self.bindvars[key]
+                except (IndexError, KeyError, TypeError):
+                    pass
+
+            if var is None:
+                var = variable_factory.new_by_column(self, values)
+            elif var.numElements < num_rows:
+                var = variable_factory.new(self, num_rows, var.type, var.size)
+
+            var.set_values(values)
+            bindvars[key] = var
+
+        self.bindvars = bindvars
+        self.perform_bind(self.is_returning)
+
+        # execute the statement, but only if the number of rows is greater than zero since Oracle raises an error
+        # otherwise
         if num_rows > 0:
             self.internal_execute(num_rows)
 
@@ -359,14 +930,16 @@ of dictionaries."""
             self.rowcount = 0
             self.actual_rows = -1 # not public interface
             self.row_num = 0
+            self.is_executed = True
         else:
-            if self.statement_type in (oci.OCI_STMT_INSERT, oci.OCI_STMT_UPDATE, oci.OCI_STMT_DELETE):
+            if self.statement_type in DML_STATEMENT_TYPES:
                 self.rowcount = OCIAttrGet(self.handle, oci.OCI_HTYPE_STMT, oci.ub4, oci.OCI_ATTR_ROW_COUNT, self.environment, "Cursor_SetRowCount()")
             else:
                 self.rowcount = -1
 
-    def perform_bind(self):
-        """Perform the binds on the cursor."""
+    def perform_bind(self, dynamic=False):
+        """Perform the binds on the cursor. Not cx_Oracle: the variables are bound dynamically if asked to, which
+executemany() does for DML returning statements."""
 
         # ensure that input sizes are reset
         # this is done before binding is attempted so that if binding fails and
@@ -378,12 +951,36 @@ of dictionaries."""
         if self.bindvars:
             if isinstance(self.bindvars, dict):
                 for key, var in self.bindvars.iteritems():
+                    self.set_dynamic_bind(var, dynamic)
                     var.bind(self, key, 0)
             else:
                 for i, var in enumerate(self.bindvars):
                     if var is not None:
+                        self.set_dynamic_bind(var, dynamic)
                         var.bind(self, None, i + 1)
 
+    def set_dynamic_bind(self, var, dynamic):
+        """Not cx_Oracle: set up the variable to be bound dynamically or as usual. A variable switching between the
+two is bound again, even to the same statement."""
+        if dynamic:
+            if var.dynamic_bind is None:
+                var.dynamic_bind = DynamicBind(var)
+                var.bound_cursor_handle = oci.POINTER(oci.OCIStmt)()
+        elif var.dynamic_bind is not None:
+            var.dynamic_bind = None
+            var.bound_cursor_handle = oci.POINTER(oci.OCIStmt)()
+
+    def get_dynamic_bind_variables(self):
+        """Not cx_Oracle: return the variables bound dynamically to the statement."""
+        if not self.is_returning or not self.bindvars:
+            return []
+
+        if isinstance(self.bindvars, dict):
+            bindvars = self.bindvars.itervalues()
+        else:
+            bindvars = self.bindvars
+        return [var for var in bindvars if var is not None and var.dynamic_bind is not None]
+
     def fixup_bound_cursor(self):
         """Fixup a cursor so that fetching and returning cursor descriptions are successful after binding a cursor to another cursor."""
         if self.handle and self.statement_type < 0:
@@ -403,6 +1000,9 @@ of dictionaries."""
         if self.statement_type != oci.OCI_STMT_SELECT:
             raise InterfaceError("not a query")
 
+        if not self.is_executed:
+            raise InterfaceError("query not executed")
+
     def internal_fetch(self, num_rows):
         """Performs the actual fetch from Oracle."""
         
@@ -413,8 +1013,10 @@ of dictionaries."""
             var.internal_fetch_num += 1
             if var.type.pre_fetch_proc:
                 var.type.pre_fetch_proc(var)
-            
+
+        start_time = time.time()
         status = oci.OCIStmtFetch(self.handle, self.environment.error_handle, num_rows, oci.OCI_FETCH_NEXT, oci.OCI_DEFAULT)
+        self.fetch_seconds = time.time() - start_time
 
         if status != oci.OCI_NO_DATA:
             self.environment.check_for_error(status, "Cursor_InternalFetch(): fetch")
@@ -429,37 +1031,96 @@ of dictionaries."""
            factory function has been defined in which case it is the result of the
            row factory function called with the argument tuple that would otherwise be
            returned."""
+        if self.lazyrows:
+            return self.create_lazy_rows(1)[0]
 
-        # create a new tuple
-        result_as_list = [None] * len(self.fetchvars)
+        # generate the function building the rows, if the defines or the row factory changed
+        if self.row_builder is None or self.row_builder_rowfactory is not self.rowfactory:
+            self.row_builder = new_row_builder(self.fetchvars, self.rowfactory)
+            self.row_builder_rowfactory = self.rowfactory
 
-        # acquire the value for each item
-        for pos, var in enumerate(self.fetchvars):
-            item = var.getvalue(self.row_num)
-            result_as_list[pos] = item
+        row = self.row_builder(self.fetchvars, self.row_num)
 
         # increment row counters
         self.row_num += 1
         self.rowcount += 1
 
-        result_as_tuple = tuple(result_as_list)
+        return row
+
+    def create_rows(self, num_rows):
+        """Create the objects for the next num_rows rows of the current batch, decoding a column at a time."""
+        if self.lazyrows:
+            return self.create_lazy_rows(num_rows)
+
+        rows = zip(*self.get_column_values(num_rows))
+
         # if a row factory is defined, call it
         if self.rowfactory is not None:
-            return self.rowfactory(result_as_tuple) #TODO: Apparently not covered by tests
-        
-        return result_as_tuple
+            return [self.rowfactory(row) for row in rows]
+
+        return rows
+
+    def create_lazy_rows(self, num_rows):
+        """Create lazy rows for the next num_rows rows of the current batch, which decode their columns only when
+           they are accessed."""
+
+        # keep a copy of what is left of the current batch, shared by its rows
+        if self.row_batch is None:
+            if self.column_indexes is None:
+                self.column_indexes = dict((item[0], i) for i, item in enumerate(self.description))
+            self.row_batch = RowBatch(self.fetchvars, self.row_num, self.actual_rows - self.row_num,
+                                      self.column_indexes)
+            self.row_batch_start = self.row_num
+
+        start = self.row_num - self.row_batch_start
+        rows = [LazyRow(self.row_batch, pos) for pos in xrange(start, start + num_rows)]
+
+        # if a row factory is defined, call it
+        if self.rowfactory is not None:
+            rows = [self.rowfactory(row) for row in rows]
+
+        # increment row counters
+        self.row_num += num_rows
+        self.rowcount += num_rows
+
+        return rows
+
+    def get_column_values(self, num_rows):
+        """Return a list of values per column for the next num_rows rows of the current batch."""
+        columns = [var.get_values(self.row_num, num_rows) for var in self.fetchvars]
+
+        # increment row counters
+        self.row_num += num_rows
+        self.rowcount += num_rows
+
+        return columns
 
     def more_rows(self):
         """Returns a boolean indicating if more rows can be retrieved from the cursor."""
         if self.row_num >= self.actual_rows:
             if self.actual_rows < 0 or self.actual_rows == self.fetch_array_size:
-                self.internal_fetch(self.fetch_array_size)
+                if self.background_fetch is not None:
+                    self.background_fetch.fetch_next(self)
+                else:
+                    if self.adaptivefetch and self.actual_rows > 0:
+                        self.adapt_fetch_array_size()
+                    self.internal_fetch(self.fetch_array_size)
+
+                # the rows of the previous batch were overwritten
+                self.row_batch = None
 
             if self.row_num >= self.actual_rows:
                 return False
 
         return True
     
+    def adapt_fetch_array_size(self):
+        """Adjust the number of rows to fetch at once from the time it took to fetch the last full batch."""
+        if self.fetch_seconds < ADAPTIVE_FETCH_FAST_SECONDS:
+            self.fetch_array_size = min(self.fetch_array_size * 2, self.fetchvars[0].allocelems)
+        elif self.fetch_seconds > ADAPTIVE_FETCH_SLOW_SECONDS:
+            self.fetch_array_size = max(self.fetch_array_size // 2, 1)
+    
     def fetchmany(self, rowLimit=None):
         if rowLimit is None:
             rowLimit = self.arraysize
@@ -491,19 +1152,30 @@ of dictionaries."""
 
         results = []
 
-        # fetch as many rows as possible
-        row_num = 0
-        while row_limit == 0 or row_num < row_limit:
+        # fetch as many rows as possible, decoding what is needed from each batch at once
+        while row_limit == 0 or len(results) < row_limit:
             more_rows_available = self.more_rows()
-            if more_rows_available:
-                row = self.create_row()
-                results.append(row)
-            else:
+            if not more_rows_available:
                 break
-            row_num += 1
+
+            num_rows = self.actual_rows - self.row_num
+            if row_limit:
+                num_rows = min(num_rows, row_limit - len(results))
+
+            results.extend(self.create_rows(num_rows))
 
         return results
-    
+
+    def fetch_column_batches(self):
+        """Generator over the remaining rows, yielding one batch per fetch from Oracle. Each batch is a list with
+one list of values per column, so the rows are never built."""
+
+        # verify fetch can be performed
+        self.verify_fetch()
+
+        while self.more_rows():
+            yield self.get_column_values(self.actual_rows - self.row_num)
+
     def set_error_offset(self, exception):
         """Set the error offset on the error object, if applicable."""
         if isinstance(exception, DatabaseError):
@@ -618,6 +1290,7 @@ of dictionaries."""
 
         # close the cursor
         self.free_handle(True)
+        self.free_statement_cache(True)
 
         self.is_open = False
         
@@ -703,6 +1376,7 @@ of dictionaries."""
 
     def __del__(self):
         self.free_handle(False)
+        self.free_statement_cache(False)
         
     def var(self, type, size=0, arraysize=None, inconverter=None, outconverter=None, typename=None):
         """Create a bind variable and return it."""
@@ -856,6 +1530,10 @@ constantly free the descriptor when an error takes place."""
         # if not a query, return None
         if self.statement_type != oci.OCI_STMT_SELECT:
             return None
+
+        # not cx_Oracle: the description is kept until another statement is prepared
+        if self.cached_description is not None:
+            return list(self.cached_description)
     
         # determine number of items in select-list
         num_items = OCIAttrGet(self.handle, oci.OCI_HTYPE_STMT, ctypes.c_int, # c_int?!
@@ -868,8 +1546,9 @@ constantly free the descriptor when an error takes place."""
         for index in xrange(num_items):
             description_element = self.get_item_description(index + 1)
             results[index] = description_element
-    
-        return results
+
+        self.cached_description = results
+        return list(results)
     
     def setoutputsize(self, size, column=-1):
         """Set the size of all of the long columns or just one of them."""
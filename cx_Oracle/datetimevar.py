@@ -4,10 +4,14 @@ from ctypes import byref
 
 from variable import Variable
 from variable_type import VariableType
-from transforms import oracle_date_to_python_date
+from transforms import ORACLE_DATE_STRUCT, oracle_date_fields_to_python_date
 
 from datetime import date, datetime
 
+# dates built recently, so repeated values in a column are only built once
+RECENT_DATES_LIMIT = 1024
+recent_dates = {}
+
 class DATETIME(Variable):
     @staticmethod
     def get_display_size(precision, scale, char_size, internal_size):
@@ -25,6 +29,7 @@ class DateTimeVariableType(VariableType):
         self.is_null_proc = None
         self.set_value_proc = self.set_value
         self.get_value_proc = self.get_value
+        self.get_values_proc = self.get_values
         self.get_buffer_size_proc = None
         self.python_type = DATETIME
         self.oracle_type = oci.SQLT_ODT
@@ -33,6 +38,7 @@ class DateTimeVariableType(VariableType):
         self.is_character_data = False
         self.is_variable_length = False
         self.can_be_copied = True
+        self.values_in_buffers = True
         self.can_be_in_array = True
         
     def set_value(self, var, pos, value):
@@ -58,9 +64,34 @@ class DateTimeVariableType(VariableType):
         oci.OCIDateSetTime(typed_data[pos], hour, minute, second)
 
     def get_value(self, var, pos):
-        typed_data = self.get_typed_data(var)
-        return_datetime = var.type == vt_DateTime
-        return oracle_date_to_python_date(typed_data[pos], return_datetime)
+        fields = ORACLE_DATE_STRUCT.unpack_from(var.data, pos * var.bufferSize)
+        return self.python_date(fields, var.type is vt_DateTime)
+
+    def get_values(self, var, start, num_rows):
+        """Returns the values stored at num_rows consecutive array positions."""
+        return_datetime = var.type is vt_DateTime
+        unpack_from = ORACLE_DATE_STRUCT.unpack_from
+        size = var.bufferSize
+        values = [None] * num_rows
+
+        # read the fields straight from the define buffer, without typed pointers
+        for i, indicator in enumerate(var.indicator[start:start + num_rows]):
+            if indicator != oci.OCI_IND_NULL:
+                fields = unpack_from(var.data, (start + i) * size)
+                values[i] = self.python_date(fields, return_datetime)
+
+        return values
+
+    def python_date(self, fields, return_datetime):
+        """Return the date object for the fields of an Oracle date, reusing a recently built one if possible."""
+        key = fields, return_datetime
+        value = recent_dates.get(key)
+        if value is None:
+            if len(recent_dates) >= RECENT_DATES_LIMIT:
+                recent_dates.clear()
+            value = recent_dates[key] = oracle_date_fields_to_python_date(fields, return_datetime)
+
+        return value
     
 vt_DateTime = DateTimeVariableType()
 vt_Date = DateTimeVariableType()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import ctypes
+import sys
+
+import oci
+from pythonic_oci import OCIAttrGet
+from variable import Variable
+from custom_exceptions import NotSupportedError
+
+# the indicator given to the OCI for the input of iterations a variable has no value for
+NULL_INDICATOR = oci.sb2(oci.OCI_IND_NULL)
+
+class ReturnedValues(Variable):
+    """Not cx_Oracle: the values returned into a variable by one iteration of a DML returning statement. The buffers
+grow to hold as many rows as the statement returns, and are decoded exactly like the variable itself."""
+
+    def __init__(self, var):
+        self.environment = var.environment
+        self.type = var.type
+        self.outconverter = var.outconverter
+        self.is_array = False
+        self.is_allocated_internally = False
+        self.size = var.size
+        self.bufferSize = var.bufferSize
+        self.numElements = self.allocelems = 0
+        self.allocate(0)
+
+    def allocate(self, num_rows):
+        """Make room for the given number of returned rows."""
+        self.numElements = num_rows
+        if num_rows <= self.allocelems and self.allocelems > 0:
+            return
+
+        self.allocelems = max(num_rows, 1)
+        self.data = ctypes.create_string_buffer(self.allocelems * self.bufferSize)
+        self.indicator = (self.allocelems * oci.sb2)()
+
+        # the OCI wants 32 bit lengths for dynamic binds
+        self.actual_length = (self.allocelems * oci.ub4)()
+        self.return_code = (self.allocelems * oci.ub2)()
+
+class DynamicBind(object):
+    """Not cx_Oracle: binds a variable to a DML returning statement with OCIBindDynamic(). The input of each
+iteration comes from the variable, as for a regular bind, and the values returned for each iteration are collected
+in ReturnedValues. The variable is not kept, to avoid a reference cycle with it."""
+
+    def __init__(self, var):
+        self.environment = var.environment
+        self.var_type = var.type
+
+        # the values returned for each row of the arguments; None if the variable is not returned into
+        self.returned_values = None
+        self.row_offset = 0
+        self.exc_info = None
+
+        # the variable is only reachable through its callbacks while the OCI executes the statement
+        self.var = None
+
+        # the OCI keeps pointers to the callbacks, so they must be kept alive as long as the bind
+        self.in_callback = oci.OCICallbackInBind(self.in_bind)
+        self.out_callback = oci.OCICallbackOutBind(self.out_bind)
+
+    def register(self, bind_handle):
+        """Register the callbacks for the bind."""
+        argtypes = oci.OCIBindDynamic.argtypes
+        status = oci.OCIBindDynamic(bind_handle, self.environment.error_handle, argtypes[2](), self.in_callback,
+                                    argtypes[4](), self.out_callback)
+        self.environment.check_for_error(status, "Variable_InternalBind(): bind dynamic")
+
+    def start(self, var, row_offset):
+        """Prepare for an execution of the statement, whose first iteration is the given row of the arguments."""
+        self.var = var
+        self.row_offset = row_offset
+        self.exc_info = None
+        if row_offset == 0:
+            self.returned_values = None
+
+    def finish(self):
+        """Finish an execution of the statement and return the exception information of the error that took place
+in the callbacks, or None."""
+        self.var = None
+        exc_info = self.exc_info
+        self.exc_info = None
+        return exc_info
+
+    def get_returned_values(self, row):
+        """Return the values returned for the given row of the arguments, creating them if needed."""
+        if self.returned_values is None:
+            self.returned_values = []
+        while len(self.returned_values) <= row:
+            self.returned_values.append(ReturnedValues(self.var))
+        return self.returned_values[row]
+
+    def in_bind(self, context, bind_handle, iteration, index, buffer_pointer, length_pointer, piece_pointer,
+                indicator_pointer):
+        """Give the OCI the input value of the iteration; called by the OCI while the statement executes."""
+        try:
+            var = self.var
+            piece_pointer[0] = oci.OCI_ONE_PIECE
+            if iteration < var.numElements:
+                buffer_pointer[0] = ctypes.addressof(var.data) + iteration * var.bufferSize
+
+                # the buffers of handle types hold pointers to what the OCI wants
+                if not var.type.values_in_buffers:
+                    buffer_pointer[0] = ctypes.c_void_p.from_buffer(var.data, iteration * var.bufferSize).value
+                if var.actual_length:
+                    length_pointer[0] = var.actual_length[iteration]
+                else:
+                    length_pointer[0] = var.bufferSize
+                indicator_pointer[0] = ctypes.addressof(var.indicator) + iteration * ctypes.sizeof(oci.sb2)
+            else:
+                buffer_pointer[0] = None
+                length_pointer[0] = 0
+                indicator_pointer[0] = ctypes.addressof(NULL_INDICATOR)
+        except:
+            self.exc_info = sys.exc_info()
+            return oci.OCI_ERROR
+
+        return oci.OCI_CONTINUE
+
+    def out_bind(self, context, bind_handle, iteration, index, buffer_pointer, length_pointer_pointer, piece_pointer,
+                 indicator_pointer, return_code_pointer_pointer):
+        """Give the OCI the buffers for a returned value; called by the OCI while the statement executes."""
+        try:
+            values = self.get_returned_values(self.row_offset + iteration)
+
+            # the number of rows returned for the iteration is known when the first one arrives
+            if index == 0:
+                if not self.var_type.values_in_buffers:
+                    raise NotSupportedError("values of this type cannot be returned into variables")
+
+                num_rows = OCIAttrGet(bind_handle, oci.OCI_HTYPE_BIND, oci.ub4, oci.OCI_ATTR_ROWS_RETURNED,
+                                      self.environment, "Variable_OutBindCallback(): rows returned")
+                values.allocate(num_rows)
+
+            pos = min(index, values.allocelems - 1)
+            values.actual_length[pos] = values.bufferSize
+            buffer_pointer[0] = ctypes.addressof(values.data) + pos * values.bufferSize
+            length_pointer_pointer[0] = ctypes.cast(ctypes.addressof(values.actual_length) +
+                                                    pos * ctypes.sizeof(oci.ub4), oci.POINTER(oci.ub4))
+            indicator_pointer[0] = ctypes.addressof(values.indicator) + pos * ctypes.sizeof(oci.sb2)
+            return_code_pointer_pointer[0] = ctypes.cast(ctypes.addressof(values.return_code) +
+                                                         pos * ctypes.sizeof(oci.ub2), oci.POINTER(oci.ub2))
+            piece_pointer[0] = oci.OCI_ONE_PIECE
+        except:
+            self.exc_info = sys.exc_info()
+            return oci.OCI_ERROR
+
+        return oci.OCI_CONTINUE
+
+    def get_value(self, row):
+        """Return the list of values returned for the given row of the arguments."""
+        if self.returned_values is None or row >= len(self.returned_values):
+            return []
+
+        values = self.returned_values[row]
+        return values.get_array_value(values.numElements)
@@ -1,11 +1,32 @@
 from ctypes import byref
 import ctypes
+import os
+import threading
+
 import oci
 from buffer import cxBuffer
 from error import Error
 from custom_exceptions import IntegrityError, OperationalError, DatabaseError, InterfaceError
 from utils import MAX_STRING_CHARS
 
+# Not cx_Oracle: the environments shared by the connections, keyed by the parameters they were created with. Threaded
+# environments are shared by the whole process; the others only by the connections of the thread which created them,
+# since the OCI does not protect them from concurrent use.
+shared_environments = {}
+thread_environments = threading.local()
+shared_environments_lock = threading.Lock()
+
+# Not cx_Oracle: the IANA names of the Oracle character sets, by character set id
+character_set_names = {}
+
+# the errors raised as integrity and operational errors, by code
+INTEGRITY_ERROR_CODES = (1, 1400, 2290, 2291, 2292)
+OPERATIONAL_ERROR_CODES = (22, 378, 602, 603, 604, 609, 1012, 1013, 1033, 1034, 1041, 1043, 1089, 1090, 1092, 3113, 3114,
+                           3122, 3135, 12153, 12203, 12500, 12571, 27146, 28511)
+
+# Not cx_Oracle: the operational errors after which the session of the connection is gone
+DISCONNECT_ERROR_CODES = (22, 1012, 1033, 1034, 1041, 1043, 1089, 1090, 1092, 3113, 3114, 3122, 3135, 12153, 12203,
+                          12500, 12571, 27146, 28511)
 
 class Environment(object):
     def __init__(self, handle):
@@ -13,7 +34,9 @@ class Environment(object):
         
         self.fixedWidth = self.maxBytesPerCharacter = 1
         self.maxStringBytes = MAX_STRING_CHARS
-        self.cloneEnv = None # used for connection pooling, but that is still TODO
+        self.cloneEnv = None # the environment the handle is shared with, which frees it
+        self.threaded = False
+        self.disconnect_error = None # not cx_Oracle: the error raised which meant the session was gone
 
         self.numberToStringFormatBuffer = cxBuffer.new_null()
         self.numberFromStringFormatBuffer = cxBuffer.new_null()
@@ -44,6 +67,7 @@ class Environment(object):
             raise InterfaceError("Unable to acquire Oracle environment handle")
 
         env = Environment(handle)
+        env.threaded = bool(threaded)
 
         c_maxBytesPerCharacter = oci.sb4()
         status = oci.OCINlsNumericInfoGet(handle, env.error_handle, byref(c_maxBytesPerCharacter), oci.OCI_NLS_CHARSET_MAXBYTESZ)
@@ -70,6 +94,42 @@ class Environment(object):
 
         return env
 
+    @staticmethod
+    def new_shared(threaded, events, encoding, nencoding):
+        """Not cx_Oracle: return a clone of the environment shared by the connections created with the same
+parameters, creating that environment first if needed. The clone has its own error handle, while the environment
+handle and the NLS information are only set up once."""
+        if threaded:
+            environments = shared_environments
+        else:
+            environments = thread_environments.__dict__.setdefault('environments', {})
+
+        # a child process cannot use the environments created by its parent
+        key = (os.getpid(), bool(threaded), bool(events), encoding, nencoding)
+        with shared_environments_lock:
+            env = environments.get(key)
+            if env is None:
+                env = environments[key] = Environment.new_from_scratch(threaded, events, encoding, nencoding)
+
+        return env.clone()
+
+    def clone(self):
+        """Return a new environment sharing the handle of this one, but with its own error handle, so it can be
+used from another thread."""
+        env = Environment(self.handle)
+        env.cloneEnv = self
+        env.threaded = self.threaded
+        env.maxBytesPerCharacter = self.maxBytesPerCharacter
+        env.maxStringBytes = self.maxStringBytes
+        env.fixedWidth = self.fixedWidth
+        env.encoding = self.encoding
+        env.nencoding = self.nencoding
+        env.numberToStringFormatBuffer = self.numberToStringFormatBuffer
+        env.numberFromStringFormatBuffer = self.numberFromStringFormatBuffer
+        env.nlsNumericCharactersBuffer = self.nlsNumericCharactersBuffer
+
+        return env
+
     @staticmethod
     def set_buffer(value, encoding):
         if value is None:
@@ -89,9 +149,14 @@ class Environment(object):
 
     def raise_error(self, context):
         error = Error(self, context, 1)
-        if error.code in (1, 1400, 2290, 2291, 2292):
+
+        # not cx_Oracle: remembered so that connections can tell they are unusable without a round trip
+        if error.code in DISCONNECT_ERROR_CODES:
+            self.disconnect_error = error
+
+        if error.code in INTEGRITY_ERROR_CODES:
             raise IntegrityError(error)
-        elif error.code in (22, 378, 602, 603, 604, 609, 1012, 1013, 1033, 1034, 1041, 1043, 1089, 1090, 1092, 3113, 3114, 3122, 3135, 12153, 12203, 12500, 12571, 27146, 28511):
+        elif error.code in OPERATIONAL_ERROR_CODES:
             raise OperationalError(error)
         else:
             raise DatabaseError(error)
@@ -110,6 +175,11 @@ class Environment(object):
         status = oci.OCIAttrGet(self.handle, oci.OCI_HTYPE_ENV, byref(c_charset_id), None, attribute, self.error_handle)
         self.check_for_error(status, "Environment_GetCharacterSetName(): get charset id")
 
+        # not cx_Oracle: the name of a character set is only looked up once
+        name = character_set_names.get(c_charset_id.value)
+        if name is not None:
+            return name
+
         # get character set name
         c_charset_name_array = ctypes.create_string_buffer(oci.OCI_NLS_MAXBUFSZ)
         c_charset_name_pointer = ctypes.cast(c_charset_name_array, oci.OCINlsCharSetIdToName.argtypes[1])
@@ -121,8 +191,9 @@ class Environment(object):
         c_iana_charset_name_pointer = ctypes.cast(c_iana_charset_name_array, oci.OCINlsNameMap.argtypes[1])
         status = oci.OCINlsNameMap(self.handle, c_iana_charset_name_pointer, oci.OCI_NLS_MAXBUFSZ, c_charset_name_pointer, oci.OCI_NLS_CS_ORA_TO_IANA)
         self.check_for_error(status, "Environment_GetCharacterSetName(): translate NLS charset")
-        
-        return c_iana_charset_name_array.value
+
+        name = character_set_names[c_charset_id.value] = c_iana_charset_name_array.value
+        return name
 
     def __del__(self):
         if self.error_handle:
@@ -6,10 +6,14 @@ import oci
 from utils import python3_or_better
 
 class Error(object):
-    def __init__(self, environment, context, retrieve_error):
+    def __init__(self, environment, context, retrieve_error, error_handle=None):
         self.context = context
         if retrieve_error:
-            if environment.error_handle:
+            if error_handle:
+                # not cx_Oracle: an error handle other than the environment's, as those of batch errors
+                handle = error_handle
+                handle_type = oci.OCI_HTYPE_ERROR
+            elif environment.error_handle:
                 handle = environment.error_handle
                 handle_type = oci.OCI_HTYPE_ERROR
             else:
@@ -0,0 +1,165 @@
+import ctypes
+
+import oci
+from variable import Variable
+
+# marks the values of a lazy row that were not decoded yet
+NOT_DECODED = object()
+
+def as_tuple(value):
+    """Return a lazy row as a tuple to compare it with, and any other value as is."""
+    if isinstance(value, LazyRow):
+        return tuple(value)
+    return value
+
+class VariableSnapshot(Variable):
+    """Not cx_Oracle: a copy of the buffers of a define variable for a range of rows, which is decoded exactly like
+the variable itself once the next fetch has overwritten the originals."""
+
+    def __init__(self, var, start, num_rows):
+        self.environment = var.environment
+        self.type = var.type
+        self.outconverter = var.outconverter
+        self.is_array = False
+        self.is_allocated_internally = False
+        self.numElements = self.allocelems = num_rows
+        self.size = var.size
+        self.bufferSize = var.bufferSize
+
+        # copy the range of rows to the start of new buffers
+        data_length = num_rows * var.bufferSize
+        self.data = ctypes.create_string_buffer(data_length)
+        ctypes.memmove(self.data, ctypes.addressof(var.data) + start * var.bufferSize, data_length)
+        self.indicator = (num_rows * oci.sb2)(*var.indicator[start:start + num_rows])
+        self.actual_length = var.actual_length
+        if var.actual_length:
+            self.actual_length = (num_rows * oci.ub2)(*var.actual_length[start:start + num_rows])
+        self.return_code = var.return_code
+        if var.return_code:
+            self.return_code = (num_rows * oci.ub2)(*var.return_code[start:start + num_rows])
+
+class RowBatch(object):
+    """Not cx_Oracle: the rows of a fetched batch shared by its lazy rows. Columns whose values are stored in the
+define buffers are kept as snapshots of them and decoded on demand; the others are decoded right away, since what
+their buffers point to does not outlive the batch."""
+
+    def __init__(self, fetchvars, start, num_rows, column_indexes):
+        self.column_indexes = column_indexes
+        self.columns = []
+        for var in fetchvars:
+            if var.type.values_in_buffers:
+                self.columns.append(VariableSnapshot(var, start, num_rows))
+            else:
+                self.columns.append(var.get_values(start, num_rows))
+
+    def get_value(self, column, pos):
+        """Return the value of a column for the row at the given position of the batch."""
+        values = self.columns[column]
+        if isinstance(values, list):
+            return values[pos]
+
+        return values.get_single_value(pos)
+
+    def get_column(self, name):
+        """Return the position of the column with the given name."""
+        try:
+            return self.column_indexes[name]
+        except KeyError:
+            pass
+
+        try:
+            return self.column_indexes[name.upper()]
+        except KeyError:
+            raise KeyError("no column named %s" % name)
+
+class LazyRow(object):
+    """Not cx_Oracle: a row of a query that decodes each column the first time it is accessed, by position or by
+name, and keeps the value. It otherwise behaves like the tuple that would have been returned: it is an instance of
+tuple for isinstance(), and copying or pickling it gives that tuple rather than the batch of rows behind it. It is not
+a subclass of tuple, as the values a tuple holds are fixed when it is created, and C code reads them directly."""
+
+    __slots__ = ('batch', 'pos', 'values')
+
+    def __init__(self, batch, pos):
+        self.batch = batch
+        self.pos = pos
+        self.values = [NOT_DECODED] * len(batch.columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return tuple([self[i] for i in xrange(*key.indices(len(self.values)))])
+
+        if isinstance(key, basestring):
+            key = self.batch.get_column(key)
+        elif key < 0:
+            key += len(self.values)
+            if key < 0:
+                raise IndexError("row index out of range")
+
+        value = self.values[key]
+        if value is NOT_DECODED:
+            value = self.values[key] = self.batch.get_value(key, self.pos)
+
+        return value
+
+    def __iter__(self):
+        for i in xrange(len(self.values)):
+            yield self[i]
+
+    def __contains__(self, value):
+        return value in tuple(self)
+
+    def __eq__(self, other):
+        return tuple(self) == as_tuple(other)
+
+    def __ne__(self, other):
+        return tuple(self) != as_tuple(other)
+
+    def __lt__(self, other):
+        return tuple(self) < as_tuple(other)
+
+    def __le__(self, other):
+        return tuple(self) <= as_tuple(other)
+
+    def __gt__(self, other):
+        return tuple(self) > as_tuple(other)
+
+    def __ge__(self, other):
+        return tuple(self) >= as_tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    @property
+    def __class__(self):
+        return tuple
+
+    def __add__(self, other):
+        return tuple(self) + tuple(other)
+
+    def __radd__(self, other):
+        return tuple(other) + tuple(self)
+
+    def __mul__(self, count):
+        return tuple(self) * count
+
+    __rmul__ = __mul__
+
+    def __reduce__(self):
+        return tuple, (tuple(self),)
+
+    def __reduce_ex__(self, protocol):
+        # object.__reduce_ex__() looks for __reduce__ on __class__, which is tuple here
+        return self.__reduce__()
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+    def index(self, value):
+        return tuple(self).index(value)
+
+    def count(self, value):
+        return tuple(self).count(value)
@@ -29,6 +29,7 @@ class LongVarBaseType(VariableType):
         self.size = 128 * 1024
         self.is_variable_length = True
         self.can_be_copied = True
+        self.values_in_buffers = True
         self.can_be_in_array = False
 
     def set_value(self, var, pos, value):
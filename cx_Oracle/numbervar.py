@@ -1,11 +1,13 @@
 import ctypes
 from ctypes import byref
 from decimal import Decimal
+from types import InstanceType
 
 from variable_type import VariableType
 from utils import python3_or_better, cxString_from_ascii, cxString_from_encoded_string
 from buffer import cxBuffer
-from transforms import oracle_number_to_python_float
+from transforms import unpack_oracle_number, oracle_number_parts_to_python_integer, oracle_number_parts_to_python_float
+from transforms import python_integer_to_oracle_number, python_float_to_oracle_number, python_decimal_to_oracle_number
 import oci
 from pythonic_oci import OCIAttrGet
 from variable import Variable
@@ -33,10 +35,20 @@ class NUMBER(Variable):
         return display_size
 
 
-# TODO: #ifdef SQLT_BFLOAT whatever
 class NATIVE_FLOAT(Variable):
     pass
 
+def number_holds_integers(precision, scale):
+    """Return whether a NUMBER column with the given precision and scale is fetched as integers."""
+    return scale == 0 or (scale == -127 and precision == 0)
+
+# Not cx_Oracle: the largest precision of the integer NUMBER columns fetched as 64-bit native integers
+MAX_NATIVE_INTEGER_PRECISION = 18
+
+def number_fits_native_integer(precision, scale):
+    """Return whether every value of a NUMBER column with the given precision and scale fits a 64-bit integer."""
+    return scale == 0 and 0 < precision <= MAX_NATIVE_INTEGER_PRECISION
+
 # variable type declarations
 class BaseNumberVarType(VariableType):
     def __init__(self):
@@ -49,10 +61,13 @@ class BaseNumberVarType(VariableType):
         self.pre_fetch_proc = None
         self.is_null_proc = None
         self.set_value_proc =  self.set_value
+        self.set_values_proc = self.set_values
         self.get_value_proc =  self.get_value
+        self.get_values_proc = self.get_values
         self.get_buffer_size_proc = None
 
         self.can_be_copied = True
+        self.values_in_buffers = True
         self.can_be_in_array = True
         
         # not standard variable type
@@ -67,6 +82,22 @@ class BaseNumberVarType(VariableType):
         if not python3_or_better():
             self.mapping_python_type_to_method[int] = self.set_value_from_integer
 
+        # Not cx_Oracle: the order in which subclasses of the types above are matched, booleans being integers
+        self.python_types_by_precedence = [bool, long, float, Decimal]
+        if not python3_or_better():
+            self.python_types_by_precedence.insert(1, int)
+
+        # Not cx_Oracle: the pure Python encoders used to set whole columns, by exact type
+        self.mapping_python_type_to_encoder = {
+            long: python_integer_to_oracle_number,
+            bool: python_integer_to_oracle_number,
+            float: python_float_to_oracle_number,
+            Decimal: python_decimal_to_oracle_number,
+           }
+
+        if not python3_or_better():
+            self.mapping_python_type_to_encoder[int] = python_integer_to_oracle_number
+
     def pre_define(self, var, param):
         """Set the type of value (integer, float or string) that will be returned when values are fetched from this variable."""
 
@@ -79,7 +110,7 @@ class BaseNumberVarType(VariableType):
             precision = OCIAttrGet(param, oci.OCI_HTYPE_DESCRIBE, oci.sb2,
                 oci.OCI_ATTR_PRECISION, var.environment, "NumberVar_PreDefine(): precision")
             
-            if scale == 0 or (scale == -127 and precision == 0):
+            if number_holds_integers(precision, scale):
                 var.type = vt_LongInteger
             
                 if not python3_or_better():
@@ -88,26 +119,7 @@ class BaseNumberVarType(VariableType):
 
     def get_value(self, var, pos):
         """Returns the value stored at the given array position."""
-        if not python3_or_better():
-            types = (vt_Boolean, vt_Integer)
-        else:
-            types = (vt_Boolean, )
-
-        typed_data = self.get_typed_data(var)
-        
-        if var.type in types:
-            c_integer_value = ctypes.c_long()
-            status = oci.OCINumberToInt(var.environment.error_handle, byref(typed_data[pos]), ctypes.sizeof(c_integer_value), oci.OCI_NUMBER_SIGNED, byref(c_integer_value))
-            integer_value = c_integer_value.value
-            var.environment.check_for_error(status, "NumberVar_GetValue(): as integer")
-
-            if not python3_or_better():
-                if var.type is vt_Integer:
-                    return integer_value
-        
-            return bool(integer_value)
-
-        if var.type in (vt_NumberAsString, vt_LongInteger):
+        if var.type is vt_NumberAsString:
             c_string = ctypes.create_string_buffer(200)
             cast_c_string = ctypes.cast(c_string, oci.POINTER(oci.ub1))
             
@@ -121,33 +133,109 @@ class BaseNumberVarType(VariableType):
 
             python_string = c_string.value
 
-            unicode_str = cxString_from_encoded_string(python_string, var.environment.encoding)
+            return cxString_from_encoded_string(python_string, var.environment.encoding)
+
+        # everything else is decoded straight from the OCINumber bytes
+        start_index = pos * var.bufferSize
+        number = bytearray(var.data[start_index:start_index + var.bufferSize])
+        negative, mantissa, exponent = unpack_oracle_number(number, 0)
+        return self.python_value_from_oracle_number(var.type, negative, mantissa, exponent)
+
+    def get_values(self, var, start, num_rows):
+        """Returns the values stored at num_rows consecutive array positions."""
+        indicators = var.indicator[start:start + num_rows]
+        values = [None] * num_rows
 
-            if var.type is vt_NumberAsString:
-                return unicode_str
+        if var.type is vt_NumberAsString:
+            for i, indicator in enumerate(indicators):
+                if indicator != oci.OCI_IND_NULL:
+                    values[i] = self.get_value(var, start + i)
+            return values
 
-            try:
-                return int(unicode_str)
-            except ValueError:
-                pass
+        # copy the whole range out of the define buffer once
+        size = var.bufferSize
+        numbers = bytearray(var.data[start * size:(start + num_rows) * size])
+        var_type = var.type
+        for i, indicator in enumerate(indicators):
+            if indicator != oci.OCI_IND_NULL:
+                negative, mantissa, exponent = unpack_oracle_number(numbers, i * size)
+                values[i] = self.python_value_from_oracle_number(var_type, negative, mantissa, exponent)
 
-        return oracle_number_to_python_float(var.environment, byref(typed_data[pos]))
+        return values
+
+    def python_value_from_oracle_number(self, var_type, negative, mantissa, exponent):
+        """Return the Python value for the variable type of an unpacked Oracle number."""
+        if var_type is not vt_Float:
+            integer_value = oracle_number_parts_to_python_integer(negative, mantissa, exponent)
+
+            # numbers with a fractional part (or infinite) are returned as floats anyway
+            if integer_value is not None:
+                if var_type is vt_Boolean:
+                    return bool(integer_value)
+                return integer_value
+
+        return oracle_number_parts_to_python_float(negative, mantissa, exponent)
 
     def set_value(self, var, pos, value):
         """Set the value of the variable."""
-        
-        for type, method in self.mapping_python_type_to_method.iteritems():
-            if isinstance(value, type):
+        method = self.mapping_python_type_to_method.get(value.__class__)
+        if method is None:
+            method = self.find_set_value_method(value)
+
+        return method(var, pos, value)
+
+    def find_set_value_method(self, value):
+        """Not cx_Oracle: return the method setting values of a subclass of the numeric types, and remember it for
+the other values of the same type."""
+        for python_type in self.python_types_by_precedence:
+            if isinstance(value, python_type):
+                method = self.mapping_python_type_to_method[python_type]
                 break
         else:
-            method = None
-        
-        if method is not None:
-            return method(var, pos, value)
-        
-        raise TypeError("expecting numeric data")
+            raise TypeError("expecting numeric data")
+
+        if value.__class__ is not InstanceType:
+            self.mapping_python_type_to_method[value.__class__] = method
+        return method
+
+    def set_values(self, var, values):
+        """Set the values of the first len(values) positions of the variable. The numbers are encoded into a single
+buffer which is copied to the variable at once; the values the encoders do not handle are set one by one afterwards."""
+        size = var.bufferSize
+        numbers = bytearray(len(values) * size)
+        indicator = var.indicator
+        encoders = self.mapping_python_type_to_encoder
+        remaining = []
+        for pos, value in enumerate(values):
+            if value is None:
+                indicator[pos] = oci.OCI_IND_NULL
+                continue
+
+            indicator[pos] = oci.OCI_IND_NOTNULL
+            encoder = encoders.get(type(value))
+            number = None
+            if encoder is not None:
+                number = encoder(value)
+            if number is None:
+                remaining.append((pos, value))
+            else:
+                numbers[pos * size:pos * size + len(number)] = number
+
+        ctypes.memmove(var.data, str(numbers), len(numbers))
+
+        for pos, value in remaining:
+            self.set_value(var, pos, value)
+
+    def set_oracle_number(self, var, pos, number):
+        """Not cx_Oracle: copy the bytes of an encoded OCINumber to the given array position."""
+        ctypes.memmove(ctypes.addressof(var.data) + pos * var.bufferSize, str(number), len(number))
     
     def set_value_from_long(self, var, pos, value):
+        # encode the number directly, leaving the ones out of range for the OCI to report
+        number = python_integer_to_oracle_number(value)
+        if number is not None:
+            return self.set_oracle_number(var, pos, number)
+
         text_value = str(value)
         text_buffer = cxBuffer.new_from_object(text_value, var.environment.encoding)
         
@@ -161,9 +249,14 @@ class BaseNumberVarType(VariableType):
         return var.environment.check_for_error(status, "NumberVar_SetValueFromLong()")
     
     def set_value_from_boolean(self, var, pos, value):
-        raise NotImplementedError()
+        self.set_oracle_number(var, pos, python_integer_to_oracle_number(int(value)))
     
     def set_value_from_float(self, var, pos, value):
+        # encode the number directly, leaving the ones out of range or not finite for the OCI to report
+        number = python_float_to_oracle_number(value)
+        if number is not None:
+            return self.set_oracle_number(var, pos, number)
+
         double_value = ctypes.c_double(value)
         typed_data = self.get_typed_data(var)
         
@@ -214,6 +307,11 @@ class BaseNumberVarType(VariableType):
         return text_obj, format_obj
     
     def set_value_from_decimal(self, var, pos, value):
+        # encode the number directly, leaving the ones out of range or not finite for the OCI to report
+        number = python_decimal_to_oracle_number(value)
+        if number is not None:
+            return self.set_oracle_number(var, pos, number)
+
         tuple_value = value.as_tuple()
         text_value, format = self.get_format_and_text_from_decimal(tuple_value)
         text_buffer = cxBuffer.new_from_object(text_value, var.environment.encoding)
@@ -230,15 +328,8 @@ class BaseNumberVarType(VariableType):
     
     if not python3_or_better():
         def set_value_from_integer(self, var, pos, value):
-            """Set the value of the variable from a Python integer."""
-            c_integer_value = ctypes.c_long(value)
-            
-            typed_data = self.get_typed_data(var)
-            
-            status = oci.OCINumberFromInt(var.environment.error_handle, byref(c_integer_value),
-                    ctypes.sizeof(c_integer_value), oci.OCI_NUMBER_SIGNED, byref(typed_data[pos]))
-            
-            var.environment.check_for_error(status, "NumberVar_SetValueFromInteger()")
+            """Set the value of the variable from a Python integer; every one of them fits an Oracle number."""
+            self.set_oracle_number(var, pos, python_integer_to_oracle_number(value))
 
 class FloatVarType(BaseNumberVarType):
     def __init__(self):
@@ -263,4 +354,100 @@ if not python3_or_better():
 
 vt_LongInteger = FloatVarType()
 
-vt_NumberAsString = FloatVarType()
\ No newline at end of file
+vt_NumberAsString = FloatVarType()
+
+class NativeFloatVarType(VariableType):
+    def __init__(self):
+        VariableType.__init__(self)
+        self.oci_type = ctypes.c_double
+
+        self.initialize_proc = None
+        self.finalize_proc = None
+        self.pre_define_proc = None
+        self.post_define_proc = None
+        self.pre_fetch_proc = None
+        self.is_null_proc = None
+        self.set_value_proc = self.set_value
+        self.get_value_proc = self.get_value
+        self.get_values_proc = self.get_values
+        self.get_buffer_size_proc = None
+        self.python_type = NATIVE_FLOAT
+        self.oracle_type = oci.SQLT_BDOUBLE
+        self.charset_form = oci.SQLCS_IMPLICIT
+        self.size = ctypes.sizeof(self.oci_type)
+
+        self.is_character_data = False
+        self.is_variable_length = False
+        self.can_be_copied = True
+        self.values_in_buffers = True
+        self.can_be_in_array = True
+
+    def get_value(self, var, pos):
+        """Returns the value stored at the given array position."""
+        return self.get_typed_data(var)[pos]
+
+    def get_values(self, var, start, num_rows):
+        """Returns the values stored at num_rows consecutive array positions."""
+        values = self.get_typed_data(var)[start:start + num_rows]
+        for i, indicator in enumerate(var.indicator[start:start + num_rows]):
+            if indicator == oci.OCI_IND_NULL:
+                values[i] = None
+
+        return values
+
+    def set_value(self, var, pos, value):
+        """Set the value of the variable."""
+        if not isinstance(value, float):
+            raise TypeError("expecting float")
+
+        self.get_typed_data(var)[pos] = value
+
+vt_NativeFloat = NativeFloatVarType()
+
+class NativeIntegerVarType(VariableType):
+    def __init__(self):
+        VariableType.__init__(self)
+        self.oci_type = ctypes.c_int64
+
+        self.initialize_proc = None
+        self.finalize_proc = None
+        self.pre_define_proc = None
+        self.post_define_proc = None
+        self.pre_fetch_proc = None
+        self.is_null_proc = None
+        self.set_value_proc = self.set_value
+        self.get_value_proc = self.get_value
+        self.get_values_proc = self.get_values
+        self.get_buffer_size_proc = None
+        self.python_type = NUMBER
+        self.oracle_type = oci.SQLT_INT
+        self.charset_form = oci.SQLCS_IMPLICIT
+        self.size = ctypes.sizeof(self.oci_type)
+
+        self.is_character_data = False
+        self.is_variable_length = False
+        self.can_be_copied = True
+        self.values_in_buffers = True
+        self.can_be_in_array = True
+
+    def get_value(self, var, pos):
+        """Returns the value stored at the given array position."""
+        return self.get_typed_data(var)[pos]
+
+    def get_values(self, var, start, num_rows):
+        """Returns the values stored at num_rows consecutive array positions."""
+        values = self.get_typed_data(var)[start:start + num_rows]
+        for i, indicator in enumerate(var.indicator[start:start + num_rows]):
+            if indicator == oci.OCI_IND_NULL:
+                values[i] = None
+
+        return values
+
+    def set_value(self, var, pos, value):
+        """Set the value of the variable."""
+        if not isinstance(value, (int, long)) or isinstance(value, bool):
+            raise TypeError("expecting integer")
+
+        self.get_typed_data(var)[pos] = value
+
+vt_NativeInteger = NativeIntegerVarType()
@@ -9,10 +9,10 @@ except ImportError:
         except ImportError:
             raise Exception("Could not import oracle libraries version 12, 11 or 10. Giving up. Don't forget to set your ORACLE_HOME and LD_LIBRARY_PATH.")
 
-ORACLE_10G = hasattr(locals(), 'OCI_ATTR_MODULE')
-ORACLE_10GR2 = hasattr(locals(), 'OCI_MAJOR_VERSION')
-ORACLE_11 = hasattr(locals(), 'OCI_ATTR_CONNECTION_CLASS')
-ORACLE_12 = hasattr(locals(), 'OCI_ATTR_DML_ROW_COUNT_ARRAY')
+ORACLE_10G = 'OCI_ATTR_MODULE' in locals()
+ORACLE_10GR2 = 'OCI_MAJOR_VERSION' in locals()
+ORACLE_11 = 'OCI_ATTR_CONNECTION_CLASS' in locals()
+ORACLE_12 = 'OCI_ATTR_DML_ROW_COUNT_ARRAY' in locals()
 
 
 # defines stuff that could not be generated by ctypesgen, or that were incorrectly generated
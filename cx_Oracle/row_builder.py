@@ -0,0 +1,50 @@
+import oci
+
+def new_row_builder(fetchvars, rowfactory):
+    """Not cx_Oracle: return a function called as build_row(fetchvars, pos), which returns the row at the given
+position of the define variables, passed through the row factory if there is one. The function is generated for
+the define variables given, so the NULL check, the conversion and the output converter of each column are resolved
+once instead of for every value. It can be used with any set of define variables of the same types and output
+converters, as the ones swapped in by background fetching."""
+    namespace = {'NULL': oci.OCI_IND_NULL, 'rowfactory': rowfactory}
+    var_names = ['var_%d' % i for i in xrange(len(fetchvars))]
+    value_names = ['value_%d' % i for i in xrange(len(fetchvars))]
+
+    lines = ['def build_row(fetchvars, pos):']
+    if fetchvars:
+        lines.append('    %s, = fetchvars' % ', '.join(var_names))
+
+    for i, var in enumerate(fetchvars):
+        var_type = var.type
+        var_name = var_names[i]
+        value_name = value_names[i]
+
+        # check for a NULL value
+        if var_type.is_null_proc:
+            namespace['is_null_%d' % i] = var_type.is_null_proc
+            lines.append('    if is_null_%d(%s, pos):' % (i, var_name))
+        else:
+            lines.append('    if %s.indicator[pos] == NULL:' % var_name)
+        lines.append('        %s = None' % value_name)
+        lines.append('    else:')
+
+        # check for truncation or other problems on retrieve
+        if var_type.is_variable_length:
+            lines.append('        %s.verify_fetch(pos)' % var_name)
+
+        # calculate the value, converting it if applicable
+        namespace['get_value_%d' % i] = var_type.get_value_proc
+        value = 'get_value_%d(%s, pos)' % (i, var_name)
+        if var.outconverter is not None:
+            namespace['outconverter_%d' % i] = var.outconverter
+            value = 'outconverter_%d(%s)' % (i, value)
+        lines.append('        %s = %s' % (value_name, value))
+
+    row = '(%s)' % ''.join(['%s, ' % value_name for value_name in value_names])
+    if rowfactory is not None:
+        lines.append('    return rowfactory(%s)' % row)
+    else:
+        lines.append('    return %s' % row)
+
+    exec compile('\n'.join(lines) + '\n', '<row builder>', 'exec') in namespace
+    return namespace['build_row']
@@ -0,0 +1,140 @@
+import ctypes
+from ctypes import byref
+
+import oci
+from buffer import cxBuffer
+from environment import Environment
+from connection import Connection
+from custom_exceptions import InterfaceError, ProgrammingError
+from pythonic_oci import OCIHandleAlloc, OCIAttrGet
+
+class SessionPool(object):
+    def __init__(self, user, password, dsn, min, max, increment, connectiontype=Connection, threaded=False,
+                 getmode=oci.OCI_SPOOL_ATTRVAL_NOWAIT, events=False, homogeneous=True, encoding=None, nencoding=None):
+        """Create a new session pool object."""
+        self.handle = oci.POINTER(oci.OCISPool)()
+        self.environment = None
+        self.username = user # public interface
+        self.password = password # public interface
+        self.tnsentry = self.dsn = dsn # public interface
+        self.min = min # public interface
+        self.max = max # public interface
+        self.increment = increment # public interface
+        self.homogeneous = bool(homogeneous) # public interface
+        self.name = None # public interface
+
+        # connections acquired from the pool are of the given type
+        if not isinstance(connectiontype, type) or not issubclass(connectiontype, Connection):
+            raise ProgrammingError("connectiontype must be a subclass of Connection")
+        self.connectiontype = connectiontype # public interface
+
+        # get the environment; connections acquired from the pool clone it
+        self.environment = Environment.new_shared(threaded, events, encoding, nencoding)
+
+        # create the session pool handle
+        OCIHandleAlloc(self.environment, self.handle, oci.OCI_HTYPE_SPOOL,
+                       "SessionPool_New(): allocate handle")
+
+        # the sessions keep their statement caches while in the pool
+        pool_mode = oci.OCI_SPC_STMTCACHE
+        if self.homogeneous:
+            pool_mode |= oci.OCI_SPC_HOMOGENEOUS
+
+        # create the session pool; the OCI names it, and sessions are acquired from it by that name
+        user_buffer = cxBuffer.new_from_object(user, self.environment.encoding)
+        password_buffer = cxBuffer.new_from_object(password, self.environment.encoding)
+        dsn_buffer = cxBuffer.new_from_object(dsn, self.environment.encoding)
+        self.c_name = oci.POINTER(oci.OraText)()
+        self.c_name_length = oci.ub4()
+        status = oci.OCISessionPoolCreate(self.environment.handle, self.environment.error_handle, self.handle,
+                                          byref(self.c_name), byref(self.c_name_length), dsn_buffer.cast_ptr,
+                                          dsn_buffer.size, min, max, increment, user_buffer.cast_ptr,
+                                          user_buffer.size, password_buffer.cast_ptr, password_buffer.size,
+                                          pool_mode)
+        self.environment.check_for_error(status, "SessionPool_New(): create pool")
+        self.name = ctypes.string_at(self.c_name, self.c_name_length.value)
+
+        # set the mode on the pool
+        self.getmode = getmode
+
+    def raise_if_not_open(self):
+        if not self.handle:
+            raise InterfaceError("not connected")
+
+    def get_attribute(self, oci_type, attribute, context):
+        """Return the value of an attribute of the session pool."""
+        self.raise_if_not_open()
+        return OCIAttrGet(self.handle, oci.OCI_HTYPE_SPOOL, oci_type, attribute, self.environment, context)
+
+    def set_attribute(self, oci_type, attribute, value, context):
+        """Set the value of an attribute of the session pool."""
+        self.raise_if_not_open()
+        c_value = oci_type(value)
+        status = oci.OCIAttrSet(self.handle, oci.OCI_HTYPE_SPOOL, byref(c_value), 0, attribute,
+                                self.environment.error_handle)
+        self.environment.check_for_error(status, context)
+
+    @property
+    def opened(self):
+        """Return the number of sessions opened by the pool."""
+        return self.get_attribute(oci.ub4, oci.OCI_ATTR_SPOOL_OPEN_COUNT, "SessionPool_GetOpenCount()")
+
+    @property
+    def busy(self):
+        """Return the number of sessions currently acquired from the pool."""
+        return self.get_attribute(oci.ub4, oci.OCI_ATTR_SPOOL_BUSY_COUNT, "SessionPool_GetBusyCount()")
+
+    @property
+    def timeout(self):
+        """Return the number of seconds after which idle sessions are closed."""
+        return self.get_attribute(oci.ub4, oci.OCI_ATTR_SPOOL_TIMEOUT, "SessionPool_GetTimeout()")
+
+    @timeout.setter
+    def timeout(self, value):
+        """Set the number of seconds after which idle sessions are closed."""
+        self.set_attribute(oci.ub4, oci.OCI_ATTR_SPOOL_TIMEOUT, value, "SessionPool_SetTimeout()")
+
+    @property
+    def getmode(self):
+        """Return what acquiring a session does when all of them are busy and the pool cannot grow."""
+        return self.get_attribute(oci.ub1, oci.OCI_ATTR_SPOOL_GETMODE, "SessionPool_GetGetMode()")
+
+    @getmode.setter
+    def getmode(self, value):
+        """Set what acquiring a session does when all of them are busy and the pool cannot grow."""
+        self.set_attribute(oci.ub1, oci.OCI_ATTR_SPOOL_GETMODE, value, "SessionPool_SetGetMode()")
+
+    def acquire(self, user=None, password=None, cclass=None, purity=None):
+        """Create a new connection within the session pool."""
+        self.raise_if_not_open()
+
+        # proxy authentication is only possible with heterogeneous pools
+        if self.homogeneous and user is not None:
+            raise ProgrammingError("pool is homogeneous. Proxy authentication is not possible.")
+
+        return self.connectiontype(user, password, pool=self, cclass=cclass, purity=purity)
+
+    def release_connection(self, connection, mode):
+        """Release the session of the connection back to the pool, with the given mode."""
+        self.raise_if_not_open()
+        if not isinstance(connection, Connection):
+            raise TypeError("expecting a connection")
+        if connection.session_pool is not self:
+            raise ProgrammingError("connection not acquired with this session pool")
+
+        connection.release_session(mode)
+
+    def release(self, connection):
+        """Release the connection back to the pool."""
+        self.release_connection(connection, oci.OCI_DEFAULT)
+
+    def drop(self, connection):
+        """Release the connection back to the pool, dropping its session instead of keeping it for reuse."""
+        self.release_connection(connection, oci.OCI_SESSRLS_DROPSESS)
+
+    def __del__(self):
+        """Destroy the session pool, closing all of its sessions."""
+        if self.handle:
+            oci.OCISessionPoolDestroy(self.handle, self.environment.error_handle, oci.OCI_SPD_FORCE)
+            oci.OCIHandleFree(self.handle, oci.OCI_HTYPE_SPOOL)
+            self.handle = oci.POINTER(oci.OCISPool)()
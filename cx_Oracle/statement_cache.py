@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+class CachedStatement(object):
+    """Not cx_Oracle: the state of a cursor which belongs to a statement it prepared: the statement handle, with the
+variables defined and bound on it. Restoring it makes the statement current again without preparing or describing
+it, and without allocating any buffer."""
+
+    # the attributes of the cursor kept with the statement
+    attributes = ('handle', 'statement', 'statement_tag', 'statement_type', 'fetchvars', 'fetch_array_size',
+                  'bindvars', 'prefetch_set', 'row_builder', 'row_builder_rowfactory', 'column_indexes',
+                  'cached_description', 'is_returning', 'define_settings')
+
+    def __init__(self, cursor):
+        for name in self.attributes:
+            setattr(self, name, getattr(cursor, name))
+
+    def restore(self, cursor):
+        """Make the statement the current one of the cursor."""
+        for name in self.attributes:
+            setattr(cursor, name, getattr(self, name))
+
+class StatementCache(object):
+    """Not cx_Oracle: the statements most recently prepared by a cursor, other than its current one, keyed by their
+text and kept in the order they were last used."""
+
+    def __init__(self):
+        self.statements = OrderedDict()
+
+    def __len__(self):
+        return len(self.statements)
+
+    def take(self, statement):
+        """Remove the cached state of the statement and return it, or None if the statement is not cached."""
+        return self.statements.pop(statement, None)
+
+    def put(self, cached_statement, max_size):
+        """Cache the state of a statement as the most recently used one, and return the states of the statements
+which no longer fit the given size, least recently used first."""
+        self.statements.pop(cached_statement.statement, None)
+        self.statements[cached_statement.statement] = cached_statement
+
+        evicted = []
+        while len(self.statements) > max_size:
+            statement, evicted_statement = self.statements.popitem(last=False)
+            evicted.append(evicted_statement)
+
+        return evicted
+
+    def clear(self):
+        """Empty the cache and return the states of the statements it held."""
+        statements = self.statements.values()
+        self.statements.clear()
+        return statements
@@ -4,8 +4,8 @@ from ctypes import byref
 from variable_type import VariableType
 import oci
 from utils import python3_or_better, cxString_from_encoded_string
-from utils import MAX_STRING_CHARS, MAX_BINARY_BYTES
-from buffer import cxBuffer
+from utils import MAX_STRING_CHARS, MAX_BINARY_BYTES, bytes
+from custom_exceptions import CXORA_TYPE_ERROR
 from variable import Variable
 
 # TODO: Deduplicate method set_max_data_size in STRING and FIXED_CHAR
@@ -70,12 +70,14 @@ class BaseStringType(VariableType):
         self.pre_fetch_proc = None
         self.is_null_proc = None
         self.set_value_proc =  self.set_value
+        self.set_values_proc = self.set_values
         self.get_value_proc =  self.get_value
         #self.get_buffer_size_proc = None
 
         #self.is_character_data = None
         #self.is_variable_length = None
         self.can_be_copied = True
+        self.values_in_buffers = True
         self.can_be_in_array = True
 
     def initialize(self, var, cursor):
@@ -95,27 +97,69 @@ class BaseStringType(VariableType):
     
         return cxString_from_encoded_string(the_data, var.environment.encoding)
 
-    def set_value(self, var, pos, value):
-        # populate the buffer and confirm the maximum size is not exceeded
-        buffer = cxBuffer.new_from_object(value, var.environment.encoding)
+    def encode_value(self, var, value):
+        """Not cx_Oracle: return the bytes stored in the buffer for the value, confirming the maximum size is not
+exceeded."""
+        if isinstance(value, unicode):
+            encoded_value = value.encode(var.environment.encoding)
+        elif isinstance(value, bytes):
+            encoded_value = value
+        else:
+            raise TypeError(CXORA_TYPE_ERROR)
 
-        if var.type.is_character_data and buffer.num_characters > MAX_STRING_CHARS:
+        if var.type.is_character_data and len(value) > MAX_STRING_CHARS:
             raise ValueError("string data too large")
-        elif not var.type.is_character_data and buffer.size > MAX_BINARY_BYTES:
+        elif not var.type.is_character_data and len(encoded_value) > MAX_BINARY_BYTES:
             raise ValueError("binary data too large")
 
+        return encoded_value
+
+    def set_value(self, var, pos, value):
+        # the value is encoded and copied straight from the resulting string to its position in the buffer
+        encoded_value = self.encode_value(var, value)
+        size = len(encoded_value)
+
         # ensure that the buffer is large enough
-        if buffer.size > var.bufferSize:
-            var.resize(buffer.num_characters)
+        if size > var.bufferSize:
+            var.resize(len(value))
 
         # keep a copy of the string
-        var.actual_length[pos] = buffer.size
-        if buffer.size:
-            pointer_to_pos = ctypes.c_void_p(ctypes.addressof(var.data) + var.bufferSize * pos)
-            #start_index = var.bufferSize * pos
-            #var.data[start_index:start_index+buffer.size] = buffer.ptr.raw[:buffer.size]
-            #ctypes.memmove(byref(var.data, var.bufferSize * pos), buffer.ptr, buffer.size)
-            ctypes.memmove(pointer_to_pos, buffer.ptr, buffer.size)
+        var.actual_length[pos] = size
+        if size:
+            ctypes.memmove(ctypes.addressof(var.data) + var.bufferSize * pos, encoded_value, size)
+
+    def set_values(self, var, values):
+        """Set the values of the first len(values) positions of the variable. The column is packed into a single
+string laid out like the buffer, which is copied to the variable at once."""
+        indicator = var.indicator
+        actual_length = var.actual_length
+        is_variable_length = var.type.is_variable_length
+        encoded_values = []
+        max_size = 0
+        max_length = 0
+        for pos, value in enumerate(values):
+            if value is None:
+                indicator[pos] = oci.OCI_IND_NULL
+                encoded_values.append('')
+                continue
+
+            indicator[pos] = oci.OCI_IND_NOTNULL
+            if is_variable_length:
+                var.return_code[pos] = 0
+            encoded_value = self.encode_value(var, value)
+            encoded_values.append(encoded_value)
+            actual_length[pos] = len(encoded_value)
+            max_size = max(max_size, len(encoded_value))
+            max_length = max(max_length, len(value))
+
+        # ensure that the buffer is large enough for all of the values
+        if max_size > var.bufferSize:
+            var.resize(max_length)
+
+        buffer_size = var.bufferSize
+        data = ''.join([encoded_value + '\0' * (buffer_size - len(encoded_value))
+                        for encoded_value in encoded_values])
+        ctypes.memmove(var.data, data, len(data))
 
 class BaseNonBinaryStringType(BaseStringType):
     def __init__(self):
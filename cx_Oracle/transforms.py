@@ -1,24 +1,196 @@
 import ctypes
 from ctypes import byref
+import struct
 from datetime import date, datetime, timedelta
+from decimal import Decimal
 
 import oci
 
-def oracle_number_to_python_float(environment, value):
-    c_double_value = ctypes.c_double()
-    status = oci.OCINumberToReal(environment.error_handle, value, ctypes.sizeof(c_double_value), byref(c_double_value))
-    environment.check_for_error(status, "OracleNumberToPythonFloat()")
+# An OCINumber is a length byte followed by up to 21 bytes in the Oracle NUMBER format: one exponent byte and up to
+# 20 base-100 mantissa digits, most significant first. Positive numbers store exponent + 193 and each digit + 1.
+# Negative numbers store the complement of the exponent byte, 101 - digit, and a 102 terminator when there is room.
+# Zero is the single byte 128 and the infinities are 255, 101 (positive) and 0 (negative).
+ORACLE_NUMBER_NEGATIVE_TERMINATOR = 102
 
-    return c_double_value.value
+# the powers of 100 that are exact as floats, so dividing by them rounds only once
+POWERS_OF_100_AS_FLOAT = [float('1e%d' % (2 * i)) for i in xrange(12)]
 
+def unpack_oracle_number(data, offset):
+    """Return the sign, mantissa and exponent of the OCINumber stored at offset in a bytearray; the number is
+(-1) ** negative * mantissa * 100 ** exponent. The mantissa and exponent are None for the infinities."""
+    length = data[offset]
+    exponent_byte = data[offset + 1]
+    start = offset + 2
+    end = offset + 1 + length
 
-def oracle_date_to_python_date(value, python_datetime):
-    year, month, day = oci.OCIDateGetDate(value)
-    hour, minute, second = oci.OCIDateGetTime(value)
+    if exponent_byte & 0x80:
+        if length == 1:
+            return False, 0, 0
 
+        if exponent_byte == 0xff and length == 2 and data[start] == 101:
+            return False, None, None
+
+        mantissa = 0
+        for pos in xrange(start, end):
+            mantissa = mantissa * 100 + data[pos] - 1
+
+        return False, mantissa, (exponent_byte & 0x7f) - 65 - (end - start - 1)
+
+    if length == 1:
+        return True, None, None
+
+    if data[end - 1] == ORACLE_NUMBER_NEGATIVE_TERMINATOR:
+        end -= 1
+
+    mantissa = 0
+    for pos in xrange(start, end):
+        mantissa = mantissa * 100 + 101 - data[pos]
+
+    return True, mantissa, (~exponent_byte & 0x7f) - 65 - (end - start - 1)
+
+def oracle_number_parts_to_python_integer(negative, mantissa, exponent):
+    """Return the number as an integer, or None if it has a fractional part or is infinite."""
+    if mantissa is None:
+        return None
+
+    if exponent < 0:
+        divisor = 100 ** -exponent
+        if mantissa % divisor:
+            return None
+        mantissa //= divisor
+    elif exponent > 0:
+        mantissa *= 100 ** exponent
+
+    if negative:
+        return -mantissa
+    return mantissa
+
+def oracle_number_parts_to_python_float(negative, mantissa, exponent):
+    """Return the number as the nearest float."""
+    if mantissa is None:
+        value = float('inf')
+    elif exponent >= 0:
+        value = float(mantissa * 100 ** exponent)
+    elif -exponent < len(POWERS_OF_100_AS_FLOAT) and mantissa < 2 ** 53:
+        # both operands are exact, so the division is correctly rounded
+        value = mantissa / POWERS_OF_100_AS_FLOAT[-exponent]
+    else:
+        value = float(Decimal('%de%d' % (mantissa, 2 * exponent)))
+
+    if negative:
+        return -value
+    return value
+
+# the most base-100 mantissa digits an OCINumber holds, and the range of its base-100 exponent
+ORACLE_NUMBER_MAX_DIGITS = 20
+ORACLE_NUMBER_MIN_EXPONENT = -65
+ORACLE_NUMBER_MAX_EXPONENT = 62
+
+INFINITY = float('inf')
+
+def pack_oracle_number(negative, mantissa, exponent):
+    """Return the OCINumber bytes, length byte first, of (-1) ** negative * mantissa * 100 ** exponent, rounding
+the mantissa half away from zero to the digits an Oracle number holds. Returns None if the number is too large or
+too small to be an Oracle number, so that the OCI can report or round it."""
+    if mantissa == 0:
+        return bytearray((1, 128))
+
+    # split the mantissa into base-100 digits, least significant first
+    digits = []
+    while mantissa:
+        mantissa, digit = divmod(mantissa, 100)
+        digits.append(digit)
+
+    # round away the digits that do not fit, carrying into the ones that are kept
+    excess = len(digits) - ORACLE_NUMBER_MAX_DIGITS
+    if excess > 0:
+        carry = digits[excess - 1] >= 50
+        del digits[:excess]
+        exponent += excess
+        pos = 0
+        while carry:
+            if pos == len(digits):
+                digits.append(1)
+                break
+            digits[pos] += 1
+            carry = digits[pos] == 100
+            if carry:
+                digits[pos] = 0
+            pos += 1
+
+    # trailing zeros are not stored
+    pos = 0
+    while digits[pos] == 0:
+        pos += 1
+    if pos:
+        del digits[:pos]
+        exponent += pos
+
+    # the exponent byte holds the exponent of the most significant digit
+    exponent += len(digits) - 1
+    if exponent > ORACLE_NUMBER_MAX_EXPONENT or exponent < ORACLE_NUMBER_MIN_EXPONENT:
+        return None
+
+    digits.reverse()
+    if not negative:
+        number = bytearray([len(digits) + 1, exponent + 193])
+        number.extend([digit + 1 for digit in digits])
+        return number
+
+    number = bytearray([len(digits) + 1, 62 - exponent])
+    number.extend([101 - digit for digit in digits])
+    if len(digits) < ORACLE_NUMBER_MAX_DIGITS:
+        number[0] += 1
+        number.append(ORACLE_NUMBER_NEGATIVE_TERMINATOR)
+    return number
+
+def python_integer_to_oracle_number(value):
+    """Return the OCINumber bytes of an integer, or None if it is out of range."""
+    if value < 0:
+        return pack_oracle_number(True, -value, 0)
+    return pack_oracle_number(False, value, 0)
+
+def decimal_parts_to_oracle_number(negative, mantissa, exponent):
+    """Return the OCINumber bytes of (-1) ** negative * mantissa * 10 ** exponent, or None if it is out of range."""
+    if exponent % 2:
+        mantissa *= 10
+        exponent -= 1
+    return pack_oracle_number(negative, mantissa, exponent // 2)
+
+def python_decimal_to_oracle_number(value):
+    """Return the OCINumber bytes of a Decimal, or None if it is out of range or not finite."""
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, (int, long)):
+        return None
+
+    mantissa = int(''.join(map(str, digits)) or '0')
+    return decimal_parts_to_oracle_number(sign, mantissa, exponent)
+
+def python_float_to_oracle_number(value):
+    """Return the OCINumber bytes of a float, or None if it is out of range or not finite. The number is the
+shortest decimal that reads back as the same float, as repr() gives it."""
+    if value != value or value in (INFINITY, -INFINITY):
+        return None
+
+    text = repr(value)
+    mantissa_text, _, exponent_text = text.partition('e')
+    integer_text, _, fraction_text = mantissa_text.partition('.')
+    exponent = -len(fraction_text)
+    if exponent_text:
+        exponent += int(exponent_text)
+
+    mantissa = int(integer_text + fraction_text)
+    return decimal_parts_to_oracle_number(text.startswith('-'), abs(mantissa), exponent)
+
+# the fields of an OCIDate: year, month and day, followed by the hour, minute and second of its OCITime
+ORACLE_DATE_STRUCT = struct.Struct('hBBBBB')
+
+def oracle_date_fields_to_python_date(fields, python_datetime):
+    """Return a Python date (or datetime) object given the fields of an Oracle date."""
     if python_datetime:
-        return datetime(year, month, day, hour, minute, second);
-    
+        return datetime(*fields)
+
+    year, month, day, hour, minute, second = fields
     return date(year, month, day)
 
 def oracle_timestamp_to_python_date(environment, value):
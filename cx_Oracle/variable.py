@@ -21,6 +21,9 @@ class Variable(object):
         self.outconverter = None  # public
         self.bound_pos = 0
 
+        # not cx_Oracle: set by the cursor to bind the variable dynamically to DML returning statements
+        self.dynamic_bind = None
+
         if num_elements < 1:
             self.numElements = self.allocelems = 1
         else:
@@ -131,10 +134,24 @@ class Variable(object):
         return self.get_single_value(array_pos)
     
     def getvalue(self, pos=0):
-        """Return the value of the variable at the given position."""
+        """Return the value of the variable at the given position. Not cx_Oracle: for a variable returned into by an
+executemany() of a DML returning statement, this is the list of values returned for the given row of the arguments."""
         # TODO: Type check like cx_oracle
+        if self.dynamic_bind is not None and self.dynamic_bind.returned_values is not None:
+            return self.dynamic_bind.get_value(pos)
         return self._get_value(pos)
 
+    def get_all_values(self):
+        """Not cx_Oracle: return the values of all the positions of the variable; for a variable returned into by an
+executemany() of a DML returning statement, a list of the lists of values returned for each row of the arguments."""
+        if self.dynamic_bind is not None and self.dynamic_bind.returned_values is not None:
+            return [self.dynamic_bind.get_value(row) for row in xrange(len(self.dynamic_bind.returned_values))]
+        if self.is_array:
+            return self.get_array_value(self.actual_elements)
+        return self.get_array_value(self.numElements)
+
+    values = property(get_all_values) # public interface, not cx_Oracle
+
     def verify_fetch(self, array_pos):
         """Verifies that truncation or other problems did not take place on retrieve."""
         if self.type.is_variable_length:
@@ -149,11 +166,54 @@ class Variable(object):
         """Return the value of the variable as an array."""
         return [self.get_single_value(i) for i in xrange(num_elements)]
 
+    def get_values(self, start, num_rows):
+        """Return a list with the values of num_rows consecutive positions, starting at the given one."""
+
+        # ensure we do not exceed the number of allocated elements
+        if start + num_rows > self.numElements:
+            raise IndexError("Variable_GetValues: array size exceeded")
+
+        var_type = self.type
+        outconverter = self.outconverter
+
+        # let the type decode the whole range at once, if it knows how
+        if var_type.get_values_proc is not None:
+            values = var_type.get_values_proc(self, start, num_rows)
+            if outconverter is not None:
+                values = [None if value is None else outconverter(value) for value in values]
+            return values
+
+        # types with their own NULL check go through the general path
+        if var_type.is_null_proc:
+            return [self.get_single_value(pos) for pos in xrange(start, start + num_rows)]
+
+        # otherwise, resolve everything that does not depend on the position once per column
+        get_value_proc = var_type.get_value_proc
+        verify_fetch = var_type.is_variable_length
+        null_indicator = oci.OCI_IND_NULL
+        values = [None] * num_rows
+        for i, indicator in enumerate(self.indicator[start:start + num_rows]):
+            if indicator == null_indicator:
+                continue
+
+            pos = start + i
+            if verify_fetch:
+                self.verify_fetch(pos)
+
+            value = get_value_proc(self, pos)
+            if outconverter is not None:
+                value = outconverter(value)
+            values[i] = value
+
+        return values
+
     def bind(self, cursor, name, pos):
         """Allocate a variable and bind it to the given statement."""
 
-        # nothing to do if already bound
-        if self.bind_handle and name == self.bound_name and pos == self.bound_pos:
+        # nothing to do if already bound; not cx_Oracle: to the same statement, as a cursor may switch between the
+        # statements it has cached
+        if self.bind_handle and name == self.bound_name and pos == self.bound_pos and \
+                self.bound_cursor_handle is cursor.handle:
             return
 
         # set the instance variables specific for binding
@@ -173,25 +233,42 @@ class Variable(object):
         else:
             alloc_elems = 0
             actual_elements_ref = oci.POINTER(oci.ub4)()
+
+        # not cx_Oracle: dynamic binds have no buffers; the OCI asks the callbacks for them while executing
+        data = self.data
+        indicator = self.indicator
+        actual_length = self.actual_length
+        return_code = self.return_code
+        mode = oci.OCI_DEFAULT
+        if self.dynamic_bind is not None:
+            argtypes = oci.OCIBindByPos.argtypes
+            data = argtypes[4]()
+            indicator = argtypes[7]()
+            actual_length = argtypes[8]()
+            return_code = argtypes[9]()
+            mode = oci.OCI_DATA_AT_EXEC
         
         # perform the bind
         if self.bound_name:
             buffer = cxBuffer.new_from_object(self.bound_name, self.environment.encoding)
             status = oci.OCIBindByName(self.bound_cursor_handle, byref(self.bind_handle),
                         self.environment.error_handle, buffer.cast_ptr,
-                        buffer.size, self.data, self.bufferSize,
-                        self.type.oracle_type, self.indicator, self.actual_length,
-                        self.return_code, alloc_elems,
-                        actual_elements_ref, oci.OCI_DEFAULT)
+                        buffer.size, data, self.bufferSize,
+                        self.type.oracle_type, indicator, actual_length,
+                        return_code, alloc_elems,
+                        actual_elements_ref, mode)
         else:
             status = oci.OCIBindByPos(self.bound_cursor_handle, byref(self.bind_handle),
-                        self.environment.error_handle, self.bound_pos, self.data,
-                        self.bufferSize, self.type.oracle_type, self.indicator,
-                        self.actual_length, self.return_code, alloc_elems,
-                        actual_elements_ref, oci.OCI_DEFAULT)
+                        self.environment.error_handle, self.bound_pos, data,
+                        self.bufferSize, self.type.oracle_type, indicator,
+                        actual_length, return_code, alloc_elems,
+                        actual_elements_ref, mode)
         
         self.environment.check_for_error(status, "Variable_InternalBind()")
 
+        if self.dynamic_bind is not None:
+            self.dynamic_bind.register(self.bind_handle)
+
         if not python3_or_better():
             # set the charset form and id if applicable
             if self.type.charset_form != oci.SQLCS_IMPLICIT:
@@ -212,6 +289,19 @@ class Variable(object):
         # set the max data size for strings
         self.set_max_data_size()
         
+    def internal_define(self, cursor_handle, position):
+        """Define the variable for the given position of the select-list of the statement."""
+
+        # perform the define; the define handle is reused if the variable was defined before
+        status = oci.OCIDefineByPos(cursor_handle, byref(self.define_handle), self.environment.error_handle, position,
+                    self.data, self.bufferSize, self.type.oracle_type, self.indicator, self.actual_length,
+                    self.return_code, oci.OCI_DEFAULT)
+        self.environment.check_for_error(status, "Variable_Define(): define")
+
+        # call the procedure to set values after define
+        if self.type.post_define_proc:
+            self.type.post_define_proc(self)
+
     def set_max_data_size(self):
         pass
 
@@ -256,6 +346,39 @@ class Variable(object):
         
         self.type.set_value_proc(self, array_pos, value)
 
+    def set_values(self, values):
+        """Set the values of the first len(values) positions of the variable, for example one column of the rows
+           of an array DML."""
+
+        # ensure we haven't exceeded the number of allocated elements
+        num_values = len(values)
+        if num_values > self.numElements:
+            raise IndexError("Variable_SetValues: array size exceeded")
+
+        # let the type set the whole column at once, if it knows how
+        if self.type.set_values_proc is not None and self.inconverter is None:
+            return self.type.set_values_proc(self, values)
+
+        # otherwise, resolve everything that does not depend on the position once per column
+        inconverter = self.inconverter
+        set_value_proc = self.type.set_value_proc
+        is_variable_length = self.type.is_variable_length
+        indicator = self.indicator
+        for pos, value in enumerate(values):
+            if inconverter is not None:
+                value = inconverter(value)
+
+            # check for a NULL value
+            if value is None:
+                indicator[pos] = oci.OCI_IND_NULL
+                continue
+
+            indicator[pos] = oci.OCI_IND_NOTNULL
+            if is_variable_length:
+                self.return_code[pos] = 0
+
+            set_value_proc(self, pos, value)
+
     def set_array_value(self, value):
         """Set all of the array values for the variable."""
 
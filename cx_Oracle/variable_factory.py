@@ -2,13 +2,15 @@ import ctypes
 from ctypes import byref
 from datetime import datetime, date, timedelta
 from decimal import Decimal
+from types import InstanceType
 
 import oci
 from pythonic_oci import OCIAttrGet, OCIParamGet
 
 from utils import python3_or_better, cxBinary, cxString, MAX_STRING_CHARS, MAX_BINARY_BYTES
 
-from numbervar import vt_Float, vt_NumberAsString, vt_Boolean, vt_LongInteger
+from numbervar import vt_Float, vt_NumberAsString, vt_Boolean, vt_LongInteger, vt_NativeFloat, vt_NativeInteger
+from numbervar import number_holds_integers, number_fits_native_integer
 from stringvar import vt_String, vt_FixedNationalChar, vt_NationalCharString, vt_FixedChar, vt_Rowid, vt_Binary
 from longvar import vt_LongString, vt_LongBinary
 from datetimevar import vt_DateTime, vt_Date
@@ -22,7 +24,7 @@ from variable import Variable
 if not python3_or_better():
     from numbervar import vt_Integer
     
-all_variable_types = [vt_Float, vt_NumberAsString, vt_Boolean, vt_LongInteger, vt_String, vt_FixedNationalChar, vt_NationalCharString, vt_FixedChar, vt_Rowid, vt_Binary, vt_LongString, vt_LongBinary, vt_DateTime, vt_Date, vt_NCLOB, vt_CLOB, vt_BLOB, vt_BFILE, vt_Timestamp, vt_Interval, vt_Cursor]
+all_variable_types = [vt_Float, vt_NumberAsString, vt_Boolean, vt_LongInteger, vt_NativeFloat, vt_NativeInteger, vt_String, vt_FixedNationalChar, vt_NationalCharString, vt_FixedChar, vt_Rowid, vt_Binary, vt_LongString, vt_LongBinary, vt_DateTime, vt_Date, vt_NCLOB, vt_CLOB, vt_BLOB, vt_BFILE, vt_Timestamp, vt_Interval, vt_Cursor]
 
 if not python3_or_better():
     all_variable_types.append(vt_Integer)
@@ -44,7 +46,6 @@ from custom_exceptions import NotSupportedError
 
 # TODO: Not implemented yet
 vt_Object = VariableType()
-vt_NativeFloat = VariableType()
 
 # this dict is only for debugging purposes.
 vt_to_name = {
@@ -63,6 +64,7 @@ vt_to_name = {
     vt_NumberAsString: 'vt_NumberAsString',
     vt_Boolean: 'vt_Boolean',
     vt_LongInteger: 'vt_LongInteger',
+    vt_NativeInteger: 'vt_NativeInteger',
     
     vt_String: 'vt_String',
     vt_FixedNationalChar: 'vt_FixedNationalChar',
@@ -99,12 +101,9 @@ mapping_python_type_to_variable_type = {
     TIMESTAMP: vt_Timestamp,
     CURSOR: vt_Cursor,
     #OBJECT: vt_Object,
+    NATIVE_FLOAT: vt_NativeFloat,
 }
 
-#ifdef SQLT_BFLOAT
-    #NATIVE_FLOAT: vt_NativeFloat
-#endif
-
         
 if not python3_or_better():
     mapping_python_type_to_variable_type[UNICODE] = vt_NationalCharString
@@ -123,6 +122,52 @@ for variable_type in all_variable_types:
 
 
 
+# Not cx_Oracle: the functions type_by_value() uses for each Python type, filled in as types are seen
+types_by_value_procs = {}
+
+def type_by_none(factory, value):
+    return vt_String, 1, None
+
+def type_by_string(factory, value):
+    size = len(value) # assuming cxString_GetSize = len
+    if size > MAX_STRING_CHARS:
+        return vt_LongString, size, None
+    return vt_String, size, None
+
+def type_by_unicode(factory, value):
+    size = len(value)
+    if size > MAX_STRING_CHARS:
+        return vt_LongString, size, None
+    return vt_NationalCharString, size, None
+
+def type_by_bytes(factory, value):
+    if len(value) > MAX_BINARY_BYTES:
+        return vt_LongBinary, None, None
+    return vt_Binary, None, None
+
+def type_by_binary(factory, value):
+    size = len(value)
+    if size > MAX_BINARY_BYTES:
+        return vt_LongBinary, size, None
+    return vt_Binary, size, None
+
+def type_by_list(factory, value):
+    for element_value in value:
+        if element_value is not None:
+            break
+    else:
+        element_value = None
+
+    var_type, _, _ = factory.type_by_value(element_value)
+    return var_type, var_type.size, len(value)
+
+def type_by_variable_type(var_type):
+    """Return a function giving the variable type for objects whose type does not depend on their value."""
+    result = var_type, None, None
+    def type_by_value(factory, value):
+        return result
+    return type_by_value
+
 class VariableFactory(object):
     """Instantiates subclasses of variables. Removes most of the staticmethods and references to subclasses 
     from Variable"""
@@ -145,8 +190,18 @@ class VariableFactory(object):
         if not var_type:
             return
 
-        if cursor.numbersAsStrings and var_type is vt_Float:
-            var_type = vt_NumberAsString
+        if var_type is vt_Float:
+            if cursor.numbersAsStrings:
+                var_type = vt_NumberAsString
+
+            # not cx_Oracle: integer NUMBER columns that fit 64 bits are fetched as native integers, and NUMBER
+            # columns that can hold fractions may be fetched as doubles; Oracle converts them in both cases
+            else:
+                precision, scale = NUMBER.lookup_precision_and_scale(cursor.environment, param)
+                if number_fits_native_integer(precision, scale):
+                    var_type = vt_NativeInteger
+                elif cursor.numbersAsNativeFloats and not number_holds_integers(precision, scale):
+                    var_type = vt_NativeFloat
 
         # retrieve size of the parameter
         size = var_type.size
@@ -180,12 +235,7 @@ class VariableFactory(object):
             var.type.pre_define_proc(var, param)
 
         # perform the define
-        status = oci.OCIDefineByPos(cursor.handle, byref(var.define_handle), var.environment.error_handle, position, var.data, var.bufferSize, var.type.oracle_type, var.indicator, var.actual_length, var.return_code, oci.OCI_DEFAULT)
-        var.environment.check_for_error(status, "Variable_Define(): define")
-
-        # call the procedure to set values after define
-        if var.type.post_define_proc:
-            var.type.post_define_proc(var)
+        var.internal_define(cursor.handle, position)
 
         return var
     
@@ -223,10 +273,10 @@ class VariableFactory(object):
                     oci.SQLT_BFILE: vt_BFILE,
                     oci.SQLT_RSET: vt_Cursor,
                     oci.SQLT_NTY: vt_Object,
-                    #oci.SQLT_BFLOAT: vt_NativeFloat, # TODO: removed #ifdef SQLT_BFLOAT
-                    #oci.SQLT_IBFLOAT: vt_NativeFloat,
-                    #oci.SQLT_BDOUBLE: vt_NativeFloat,
-                    #oci.SQLT_IBDOUBLE: vt_NativeFloat,
+                    oci.SQLT_BFLOAT: vt_NativeFloat,
+                    oci.SQLT_IBFLOAT: vt_NativeFloat,
+                    oci.SQLT_BDOUBLE: vt_NativeFloat,
+                    oci.SQLT_IBDOUBLE: vt_NativeFloat,
                   }
 
         if oracle_data_type == oci.SQLT_AFC:
@@ -348,85 +398,87 @@ variable type."""
 
     def type_by_value(self, value):
         """Return a variable type given a Python object or NULL if the Python object does not have a corresponding 
-variable type."""
+variable type. Not cx_Oracle: the way the type is determined is looked up by the exact type of the object, and found
+with isinstance() only the first time an object of that type is seen."""
+        python_type = value.__class__
+        type_by_value_proc = types_by_value_procs.get(python_type)
+        if type_by_value_proc is None:
+            type_by_value_proc = self.find_type_by_value_proc(value)
+            if python_type is not InstanceType:
+                types_by_value_procs[python_type] = type_by_value_proc
+
+        return type_by_value_proc(self, value)
+
+    def find_type_by_value_proc(self, value):
+        """Not cx_Oracle: return the function which determines the variable type of objects of the type of the given
+one, called as proc(factory, value) and returning the same as type_by_value()."""
 
         # handle scalars
         if value is None:
-            return vt_String, 1, None
+            return type_by_none
 
         if isinstance(value, cxString):
-            size = len(value) # assuming cxString_GetSize = len
-            if size > MAX_STRING_CHARS:
-                type = vt_LongString
-            else:
-                type = vt_String
-            return type, size, None
+            return type_by_string
 
         if not python3_or_better():
             if isinstance(value, unicode):
-                size = len(value)
-                if size > MAX_STRING_CHARS:
-                    type = vt_LongString
-                else:
-                    type = vt_NationalCharString
-                return type, size, None
+                return type_by_unicode
 
             if isinstance(value, int):
-                return vt_Integer, None, None
+                return type_by_variable_type(vt_Integer)
         else:
             if isinstance(value, bytes):
-                size = len(value)
-                if size > MAX_BINARY_BYTES:
-                    type = vt_LongBinary
-                else:
-                    type = vt_Binary
-
-                return type, None, None
+                return type_by_bytes
 
         if isinstance(value, long):
-            return vt_LongInteger, None, None
+            return type_by_variable_type(vt_LongInteger)
         if isinstance(value, float):
-            return vt_Float, None, None
+            return type_by_variable_type(vt_Float)
         if isinstance(value, cxBinary):
-            size = len(value)
-            if size > MAX_BINARY_BYTES:
-                type = vt_LongBinary
-            else:
-                type = vt_Binary
-            
-            return type, size, None
+            return type_by_binary
 
         if isinstance(value, bool):
-            return vt_Boolean, None, None
+            return type_by_variable_type(vt_Boolean)
         if isinstance(value, datetime):
-            return vt_DateTime, None, None
+            return type_by_variable_type(vt_DateTime)
         if isinstance(value, date):
-            return vt_DateTime, None, None
+            return type_by_variable_type(vt_DateTime)
         if isinstance(value, timedelta):
-            return vt_Interval, None, None
+            return type_by_variable_type(vt_Interval)
 
         from cursor import Cursor
 
         is_cursor = isinstance(value, Cursor)
         if is_cursor:
-            return vt_Cursor, None, None
+            return type_by_variable_type(vt_Cursor)
 
         if isinstance(value, Decimal):
-            return vt_NumberAsString, None, None
+            return type_by_variable_type(vt_NumberAsString)
 
         # handle arrays
         if isinstance(value, list):
-            for element_value in value:
-                if element_value is not None:
-                    break
+            return type_by_list
 
-            var_type, _, _ = self.type_by_value(element_value)
-            num_elements = len(value)
-            size = var_type.size
-            return var_type, size, num_elements
-
-        raise NotSupportedError("Variable_TypeByValue(): unhandled data type %.*s" % type(value))
+        raise NotSupportedError("Variable_TypeByValue(): unhandled data type %s" % type(value).__name__)
     
+    def new_by_column(self, cursor, values):
+        """Not cx_Oracle: allocate a new variable for binding a column of values. The type is determined once, from the
+first value which is not None, and strings are sized for the longest value of the column."""
+        for value in values:
+            if value is not None:
+                break
+        else:
+            value = None
+
+        var_type, size, _ = self.type_by_value(value)
+
+        # only strings have a size here
+        if size is not None and value is not None:
+            longest_value = max([value for value in values if value is not None], key=len)
+            var_type, size, _ = self.type_by_value(longest_value)
+
+        return self.new(cursor, len(values), var_type, size)
+
     def new(self, cursor, num_elements, type, size):
         variable_class = mapping_variable_type_to_python_type.get(type)
         
@@ -3,6 +3,21 @@ import ctypes
 import oci
 
 class VariableType(object):
+    # Not cx_Oracle: optional bulk counterpart of get_value_proc. When set, it is
+    # called as get_values_proc(var, start, num_rows) and must return a list with
+    # the values of that range of positions, using None for NULL values.
+    get_values_proc = None
+
+    # Not cx_Oracle: whether the values are stored in the buffers of the variable
+    # themselves, rather than in descriptors or handles the buffers point to, so
+    # that a copy of the buffers can be decoded later on.
+    values_in_buffers = False
+
+    # Not cx_Oracle: optional bulk counterpart of set_value_proc. When set, it is
+    # called as set_values_proc(var, values) to set the first len(values)
+    # positions, including their indicators, in one pass.
+    set_values_proc = None
+
     def __init__(self):
         #self.initialize_proc = None
         #self.finalize_proc = None
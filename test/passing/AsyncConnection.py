@@ -0,0 +1,68 @@
+"""Module for testing asynchronous connections."""
+
+import unittest
+
+asyncio = cx_Oracle.async_connection.asyncio
+isSupported = asyncio is not None and \
+        cx_Oracle.async_connection.ThreadPoolExecutor is not None
+
+@unittest.skipIf(not isSupported, "asyncio or trollius not available")
+class TestAsyncConnection(TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection = self.loop.run_until_complete(
+                cx_Oracle.AsyncConnection.connect(USERNAME, PASSWORD,
+                TNSENTRY, loop = self.loop))
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.connection.close())
+        self.loop.close()
+
+    def testFetch(self):
+        """test fetching rows asynchronously"""
+        cursor = self.connection.cursor()
+        cursor.arraysize = 3
+        self.loop.run_until_complete(cursor.execute(
+                "select IntCol from TestNumbers order by IntCol"))
+        row = self.loop.run_until_complete(cursor.fetchone())
+        self.failUnlessEqual(row, (1,))
+        rows = self.loop.run_until_complete(cursor.fetchmany(4))
+        self.failUnlessEqual(rows, [(2,), (3,), (4,), (5,)])
+        rows = self.loop.run_until_complete(cursor.fetchall())
+        self.failUnlessEqual(rows, [(n,) for n in range(6, 11)])
+        self.failUnlessEqual(self.loop.run_until_complete(cursor.fetchone()),
+                None)
+
+    def testConcurrentCalls(self):
+        """test calls on one connection run one at a time and in order"""
+        cursor_1 = self.connection.cursor()
+        cursor_2 = self.connection.cursor()
+        futures = [
+                cursor_1.execute("truncate table TestExecuteMany"),
+                cursor_1.execute("insert into TestExecuteMany (IntCol) " \
+                        "values (1)"),
+                cursor_2.execute("select count(*) from TestExecuteMany")]
+        self.loop.run_until_complete(asyncio.wait(futures, loop = self.loop))
+        count, = self.loop.run_until_complete(cursor_2.fetchone())
+        self.failUnlessEqual(count, 1)
+        self.loop.run_until_complete(self.connection.rollback())
+
+    def testErrors(self):
+        """test errors are raised by the futures"""
+        cursor = self.connection.cursor()
+        future = cursor.execute("select 1 / 0 from dual")
+        self.failUnlessRaises(cx_Oracle.DatabaseError,
+                self.loop.run_until_complete, future)
+
+    def testPool(self):
+        """test acquiring and releasing asynchronous connections"""
+        pool = cx_Oracle.AsyncConnectionPool(cx_Oracle.ConnectionPool(USERNAME,
+                PASSWORD, TNSENTRY, 0, 1), loop = self.loop)
+        connection = self.loop.run_until_complete(pool.acquire())
+        self.failUnless(connection.is_healthy())
+        self.loop.run_until_complete(connection.ping())
+        self.failUnlessEqual(pool.getmetrics()["busy"], 1)
+        self.loop.run_until_complete(pool.release(connection))
+        self.failUnlessEqual(pool.getmetrics()["busy"], 0)
+        self.loop.run_until_complete(pool.close())
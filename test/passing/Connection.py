@@ -73,6 +73,44 @@ class TestConnection(TestCase):
                 self.tnsentry)
         self.failUnless(isinstance(connection.version, str))
 
+    def testStmtCacheSize(self):
+        "connection statement cache size can be changed"
+        connection = cx_Oracle.connect(self.username, self.password,
+                self.tnsentry)
+        connection.stmtcachesize = 40
+        self.failUnlessEqual(connection.stmtcachesize, 40)
+        self.failUnlessRaises(TypeError, setattr, connection,
+                "stmtcachesize", "40")
+
+    def testSharedEnvironment(self):
+        "connections share the environment but not the error handle"
+        import ctypes
+        address = lambda handle: ctypes.cast(handle, ctypes.c_void_p).value
+        connection_1 = cx_Oracle.connect(self.username, self.password,
+                self.tnsentry, threaded = True)
+        connection_2 = cx_Oracle.connect(self.username, self.password,
+                self.tnsentry, threaded = True)
+        self.failUnlessEqual(address(connection_1.environment.handle),
+                address(connection_2.environment.handle))
+        self.failIfEqual(address(connection_1.environment.error_handle),
+                address(connection_2.environment.error_handle))
+        connection_1.close()
+        del connection_1
+        cursor = connection_2.cursor()
+        cursor.execute("select count(*) from TestNumbers")
+        count, = cursor.fetchone()
+        self.failUnlessEqual(count, 10)
+
+    def testPing(self):
+        "connection can be checked with and without a round trip"
+        connection = cx_Oracle.connect(self.username, self.password,
+                self.tnsentry)
+        self.failUnlessEqual(connection.ping(), None)
+        self.failUnless(connection.is_healthy())
+        connection.close()
+        self.failUnlessRaises(cx_Oracle.InterfaceError, connection.ping)
+        self.failIf(connection.is_healthy())
+
     def testRollbackOnClose(self):
         "connection rolls back before close"
         connection = cx_Oracle.connect(self.username, self.password,
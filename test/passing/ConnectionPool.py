@@ -0,0 +1,104 @@
+"""Module for testing connection pools."""
+
+import threading
+import time
+
+class TestConnectionPool(TestCase):
+
+    def __ConnectAndDrop(self):
+        """Connect to the database, perform a query and drop the connection."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("select count(*) from TestNumbers")
+            count, = cursor.fetchone()
+            self.failUnlessEqual(count, 10)
+
+    def testPool(self):
+        """test that the pool is created and has the right attributes"""
+        pool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY, 1, 2)
+        self.failUnlessEqual(pool.opened, 1, "opened differs")
+        self.failUnlessEqual(pool.busy, 0, "busy not 0 at start")
+        connection_1 = pool.acquire()
+        self.failUnlessEqual(pool.busy, 1, "busy not 1 after acquire")
+        self.failUnlessEqual(pool.opened, 1, "opened not unchanged")
+        connection_2 = pool.acquire()
+        self.failUnlessEqual(pool.opened, 2, "opened not changed")
+        self.failUnlessRaises(cx_Oracle.OperationalError, pool.acquire,
+                timeout = 0.1)
+        pool.release(connection_2)
+        self.failUnlessEqual(pool.busy, 1, "busy not 1 after release")
+        self.failUnless(pool.acquire() is connection_2,
+                "idle connection not reused")
+        metrics = pool.getmetrics()
+        self.failUnlessEqual(metrics["acquires"], 3)
+        self.failUnlessEqual(metrics["timeouts"], 1)
+        self.failUnlessEqual(metrics["utilization"], 1.0)
+        otherPool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY,
+                0, 1)
+        self.failUnlessRaises(cx_Oracle.ProgrammingError, otherPool.release,
+                connection_1)
+
+    def testRollbackOnRelease(self):
+        "connection rolls back before released back to the pool"
+        pool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY, 1, 1)
+        connection = pool.acquire()
+        cursor = connection.cursor()
+        cursor.execute("truncate table TestExecuteMany")
+        cursor.execute("insert into TestExecuteMany (IntCol) values (1)")
+        pool.release(connection)
+        connection = pool.acquire()
+        cursor = connection.cursor()
+        cursor.execute("select count(*) from TestExecuteMany")
+        count, = cursor.fetchone()
+        self.failUnlessEqual(count, 0)
+
+    def testMaxLifetime(self):
+        "connections are closed once past their lifetime"
+        pool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY, 0, 2,
+                maxlifetime = 0.1)
+        connection = pool.acquire()
+        time.sleep(0.2)
+        pool.release(connection)
+        self.failUnlessEqual(pool.opened, 0, "expired connection kept")
+        self.failIf(pool.acquire() is connection,
+                "expired connection reused")
+        self.failUnlessEqual(pool.getmetrics()["discarded"], 1)
+
+    def testIdleTimeout(self):
+        "idle connections beyond the minimum are closed"
+        pool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY, 1, 3,
+                timeout = 0.1)
+        connections = [pool.acquire() for i in range(3)]
+        for connection in connections:
+            pool.release(connection)
+        self.failUnlessEqual(pool.opened, 3, "idle connections closed early")
+        time.sleep(0.2)
+        pool.release(pool.acquire())
+        self.failUnlessEqual(pool.opened, 1, "idle connections not closed")
+
+    def testDiscardDeadConnection(self):
+        "connections whose session is gone are not reused"
+        pool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY, 0, 2,
+                pinginterval = 0)
+        connection = pool.acquire()
+        connection.close()
+        pool.release(connection)
+        self.failUnlessEqual(pool.opened, 0, "dead connection kept")
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.close()
+        self.failIf(pool.acquire() is connection,
+                "dead connection handed out")
+
+    def testThreading(self):
+        """test connection pool with multiple threads"""
+        self.pool = cx_Oracle.ConnectionPool(USERNAME, PASSWORD, TNSENTRY, 2,
+                5, threaded = True)
+        threads = []
+        for i in range(20):
+            thread = threading.Thread(None, self.__ConnectAndDrop)
+            threads.append(thread)
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.failUnless(self.pool.getmetrics()["max_busy"] <= 5)
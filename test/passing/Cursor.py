@@ -1,6 +1,8 @@
 """Module for testing cursor objects."""
 
+import copy
 import cx_Oracle
+import pickle
 import sys
 
 class TestCursor(BaseTestCase):
@@ -155,6 +157,252 @@ class TestCursor(BaseTestCase):
                 statement, rows)
         self.failUnlessEqual(self.cursor.rowcount, 3)
 
+    def testExecuteManyInBatches(self):
+        """test executing a statement multiple times (in batches)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        rows = ((n, n % 2 and "String %d" % n or None) for n in range(1, 251))
+        statement = "insert into TestExecuteMany (IntCol, StringCol) values (:1, :2)"
+        self.cursor.executemany(statement, rows, batchsize = 100)
+        self.failUnlessEqual(self.cursor.rowcount, 250)
+        rows = ({"value" : n} for n in range(251, 261))
+        statement = "insert into TestExecuteMany (IntCol) values (:value)"
+        self.cursor.executemany(statement, rows)
+        self.failUnlessEqual(self.cursor.rowcount, 10)
+        self.connection.commit()
+        self.cursor.execute("select count(*), count(StringCol) from TestExecuteMany")
+        self.failUnlessEqual(self.cursor.fetchone(), (260, 125))
+
+    def testExecuteManyInBatchesWithException(self):
+        """test executing a statement multiple times (in batches, with exception)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        rows = iter([[n] for n in (1, 2, 3, 4, 5, 3, 7)])
+        statement = "insert into TestExecuteMany (IntCol) values (:1)"
+        self.failUnlessRaises(cx_Oracle.DatabaseError, self.cursor.executemany,
+                statement, rows, batchsize = 2)
+        self.failUnlessEqual(self.cursor.rowcount, 5)
+
+    def testBindTypesRemembered(self):
+        """test binding values of the same types to alternating statements"""
+        class Integer(int):
+            pass
+        class String(str):
+            pass
+        sql1 = "select :1 + 1 from dual"
+        sql2 = "select :value || 'X' from dual"
+        for value in (1, Integer(5), 7L, 2.5, True, 3):
+            self.cursor.execute(sql1, [value])
+            self.failUnlessEqual(self.cursor.fetchone(), (value + 1,))
+            for text in ("A", "ABCDEF", String("ABC"), u"AB", None):
+                self.cursor.execute(sql2, value = text)
+                self.failUnlessEqual(self.cursor.fetchone(),
+                        ((text or "") + "X",))
+        self.failUnlessRaises(cx_Oracle.NotSupportedError,
+                self.cursor.execute, sql1, [object()])
+        sql3 = "select length(:value) from dual"
+        for text in ("A" * 5000, "ABC"):
+            self.cursor.execute(sql3, value = text)
+            self.failUnlessEqual(self.cursor.fetchone(), (len(text),))
+            self.cursor.execute(sql1, [1])
+        self.failIf((sql3, "value") in self.cursor.bind_types)
+
+    def testStatementCache(self):
+        """test switching between statements kept by the cursor"""
+        sql1 = "select IntCol from TestNumbers where IntCol = :1"
+        sql2 = "select IntCol, StringCol from TestExecuteMany"
+        self.failUnlessEqual(self.cursor.statementcachesize, 0)
+        self.cursor.statementcachesize = 20
+        self.cursor.execute(sql1, [3])
+        fetchVars = self.cursor.fetchvars
+        bindVars = self.cursor.bindvars
+        self.failUnlessEqual(self.cursor.fetchall(), [(3,)])
+        self.cursor.execute(sql2)
+        self.cursor.fetchall()
+        self.cursor.execute(sql1, [4])
+        self.failUnless(self.cursor.fetchvars is fetchVars)
+        self.failUnless(self.cursor.bindvars is bindVars)
+        self.failUnlessEqual(self.cursor.fetchall(), [(4,)])
+        self.failUnlessEqual(self.cursor.statement, sql1)
+        self.cursor.execute(sql2)
+        self.cursor.numbersAsStrings = True
+        self.cursor.execute(sql1, [4])
+        self.failIf(self.cursor.fetchvars is fetchVars)
+        self.failUnlessEqual(self.cursor.fetchall(), [("4",)])
+        self.cursor.numbersAsStrings = None
+        self.cursor.statementcachesize = 0
+        self.cursor.execute(sql2)
+        self.cursor.execute(sql1, [5])
+        self.failIf(self.cursor.fetchvars is fetchVars)
+        self.failUnlessEqual(self.cursor.fetchall(), [(5,)])
+
+    def testDescriptionCache(self):
+        """test that descriptions are kept for the statements executed"""
+        sql = "select IntCol, StringCol from TestExecuteMany"
+        description = [ ('INTCOL', cx_Oracle.NUMBER, 10, 22, 9, 0, 0),
+                ('STRINGCOL', cx_Oracle.STRING, 100, 100, 0, 0, 1) ]
+        self.cursor.execute(sql)
+        self.failUnlessEqual(self.cursor.description, description)
+        self.cursor.description.pop()
+        self.failUnlessEqual(self.cursor.description, description)
+        self.failIf(sql in self.connection.description_cache)
+        self.connection.descriptioncachesize = 100
+        self.cursor.execute("select 1 from dual")
+        self.cursor.execute(sql)
+        self.failUnlessEqual(self.cursor.description, description)
+        self.failUnless(sql in self.connection.description_cache)
+        otherCursor = self.connection.cursor()
+        otherCursor.execute(sql)
+        self.failUnlessEqual(otherCursor.description, description)
+        otherCursor.numbersAsStrings = True
+        otherCursor.execute("select IntCol, StringCol from TestExecuteMany ")
+        self.failUnlessEqual(otherCursor.description, description)
+        self.cursor.execute("select 1 from dual")
+        self.failUnlessEqual(len(self.cursor.description), 1)
+
+    def testParse(self):
+        """test parsing statements without executing them"""
+        sql = "select IntCol, StringCol from TestExecuteMany where IntCol > :1"
+        self.cursor.parse(sql)
+        self.failUnlessEqual(self.cursor.statement, sql)
+        self.failUnlessEqual(self.cursor.description,
+                [ ('INTCOL', cx_Oracle.NUMBER, 10, 22, 9, 0, 0),
+                  ('STRINGCOL', cx_Oracle.STRING, 100, 100, 0, 0, 1) ])
+        self.failUnlessEqual(len(self.cursor.fetchvars), 2)
+        self.cursor.execute("truncate table TestExecuteMany")
+        self.cursor.execute("insert into TestExecuteMany (IntCol) values (1)")
+        self.cursor.parse(sql)
+        self.cursor.execute(None, [0])
+        self.failUnlessEqual(self.cursor.fetchall(), [(1, None)])
+        self.cursor.parse("update TestExecuteMany set IntCol = 2")
+        self.failUnlessEqual(self.cursor.description, None)
+        self.cursor.execute("select count(*) from TestExecuteMany " \
+                "where IntCol = 2")
+        self.failUnlessEqual(self.cursor.fetchone(), (0,))
+        self.failUnlessRaises(cx_Oracle.DatabaseError, self.cursor.parse,
+                "select NoSuchCol from TestExecuteMany")
+
+    def testParseThenFetch(self):
+        """test fetching from a query parsed but not executed"""
+        cursor = self.connection.cursor()
+        cursor.parse("select IntCol from TestNumbers")
+        self.failUnlessRaises(cx_Oracle.InterfaceError, cursor.fetchone)
+        cursor.execute("select IntCol from TestNumbers order by IntCol")
+        self.failUnlessEqual(cursor.fetchone(), (1,))
+        cursor.parse("select IntCol, StringCol from TestExecuteMany")
+        self.failUnlessRaises(cx_Oracle.InterfaceError, cursor.fetchall)
+        cursor.parse("select IntCol from TestNumbers order by IntCol")
+        self.failUnlessRaises(cx_Oracle.InterfaceError, cursor.fetchone)
+        cursor.execute(None)
+        self.failUnlessEqual(cursor.fetchone(), (1,))
+
+    def testExecuteManyWithBatchErrors(self):
+        """test executing a statement multiple times (with batch errors)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        rows = [[n] for n in (1, 2, 2, 3, 4, 4, 5)]
+        statement = "insert into TestExecuteMany (IntCol) values (:1)"
+        self.cursor.executemany(statement, rows, batcherrors = True)
+        self.failUnlessEqual(self.cursor.rowcount, 5)
+        errors = self.cursor.getbatcherrors()
+        self.failUnlessEqual([e.offset for e in errors], [2, 5])
+        self.failUnlessEqual([e.code for e in errors], [1, 1])
+        self.cursor.execute("truncate table TestExecuteMany")
+        rows = iter(rows)
+        self.cursor.executemany(statement, rows, batchsize = 3,
+                batcherrors = True)
+        self.failUnlessEqual(self.cursor.rowcount, 5)
+        errors = self.cursor.getbatcherrors()
+        self.failUnlessEqual([e.offset for e in errors], [2, 5])
+
+    def testExecuteManyWithArrayDMLRowCounts(self):
+        """test executing a statement multiple times (with row counts)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        rows = [[n, "String %d" % (n % 3)] for n in range(1, 11)]
+        statement = "insert into TestExecuteMany (IntCol, StringCol) " \
+                "values (:1, :2)"
+        self.cursor.executemany(statement, rows)
+        self.failUnlessRaises(cx_Oracle.InterfaceError,
+                self.cursor.getarraydmlrowcounts)
+        statement = "delete from TestExecuteMany where StringCol = :1"
+        rows = [["String 0"], ["String 1"], ["String 3"]]
+        self.cursor.executemany(statement, rows, arraydmlrowcounts = True)
+        self.failUnlessEqual(self.cursor.getarraydmlrowcounts(), [3, 4, 0])
+        self.failUnlessEqual(self.cursor.rowcount, 7)
+
+    def testExecuteManyBeforeOracle12(self):
+        """test executing a statement multiple times with an older client"""
+        oracle12 = cx_Oracle.oci.ORACLE_12
+        cx_Oracle.oci.ORACLE_12 = False
+        try:
+            self.cursor.execute("truncate table TestExecuteMany")
+            rows = [[n] for n in range(1, 6)]
+            statement = "insert into TestExecuteMany (IntCol) values (:1)"
+            self.cursor.executemany(statement, rows)
+            self.failUnlessEqual(self.cursor.rowcount, 5)
+            self.cursor.executemany(statement, iter(rows), batchsize = 2,
+                    batcherrors = True)
+            self.failUnlessEqual(len(self.cursor.getbatcherrors()), 5)
+            self.failUnlessRaises(cx_Oracle.NotSupportedError,
+                    self.cursor.executemany, statement, rows,
+                    arraydmlrowcounts = True)
+        finally:
+            cx_Oracle.oci.ORACLE_12 = oracle12
+
+    def testExecuteManyWithReturning(self):
+        """test executing a statement multiple times (with DML returning)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        outVar = self.cursor.var(cx_Oracle.NUMBER)
+        rows = [[n, "String %d" % (n % 3), outVar] for n in range(1, 11)]
+        statement = "insert into TestExecuteMany (IntCol, StringCol) " \
+                "values (:1, :2) returning IntCol * 2 into :3"
+        self.cursor.executemany(statement, rows, batchsize = 4)
+        self.failUnlessEqual(outVar.values,
+                [[n * 2] for n in range(1, 11)])
+        self.failUnlessEqual(outVar.getvalue(9), [20])
+        statement = "delete from TestExecuteMany where StringCol = :1 " \
+                "returning IntCol into :2"
+        rows = [["String 0", outVar], ["String 3", outVar],
+                ["String 1", outVar]]
+        self.cursor.executemany(statement, rows)
+        self.failUnlessEqual([sorted(v) for v in outVar.values],
+                [[3, 6, 9], [], [1, 4, 7, 10]])
+        self.failUnlessEqual(self.cursor.rowcount, 7)
+
+    def testExecuteWithReturning(self):
+        """test executing a statement once (with DML returning)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        outVar = self.cursor.var(cx_Oracle.NUMBER)
+        statement = "insert into TestExecuteMany (IntCol, StringCol) " \
+                "values (:1, :2) returning IntCol * 2 into :3"
+        self.cursor.execute(statement, [1, "String 1", outVar])
+        self.failUnlessEqual(outVar.getvalue(), 2)
+        self.cursor.executemany(statement, [[2, "String 2", outVar]])
+        self.failUnlessEqual(outVar.getvalue(), [4])
+        self.cursor.execute(statement, [3, "String 3", outVar])
+        self.failUnlessEqual(outVar.getvalue(), 6)
+
+    def testExecuteManyColumns(self):
+        """test executing a statement multiple times (columns)"""
+        self.cursor.execute("truncate table TestExecuteMany")
+        intCol = range(1, 101)
+        stringCol = [n % 3 and "String %d" % n or None for n in intCol]
+        sql = "insert into TestExecuteMany (IntCol, StringCol) values (:1, :2)"
+        self.cursor.executemany_columns(sql, [intCol, stringCol])
+        self.failUnlessEqual(self.cursor.rowcount, len(intCol))
+        sql = """
+                insert into TestExecuteMany (IntCol, StringCol)
+                values (:intCol, :stringCol)"""
+        self.cursor.executemany_columns(sql,
+                dict(intCol = [101, 102], stringCol = [None, None]))
+        self.connection.commit()
+        self.cursor.execute("""
+                select IntCol, StringCol
+                from TestExecuteMany
+                order by IntCol""")
+        self.failUnlessEqual(self.cursor.fetchall(),
+                zip(intCol, stringCol) + [(101, None), (102, None)])
+        self.failUnlessRaises(cx_Oracle.ProgrammingError,
+                self.cursor.executemany_columns, sql,
+                dict(intCol = [103, 104], stringCol = ["A"]))
+
     def testPrepare(self):
         """test preparing a statement and executing it multiple times"""
         self.failUnlessEqual(self.cursor.statement, None)
@@ -251,3 +499,136 @@ class TestCursor(BaseTestCase):
                 end;""", [var, 'test_', 5, '_second_', 3, 7])
         self.failUnlessEqual(var.getvalue(), "test_5_second_37")
 
+    def testRowFactory(self):
+        """test fetching rows through a row factory"""
+        self.cursor.execute("""
+                select IntCol, NullableCol
+                from TestNumbers
+                where IntCol <= 3
+                order by IntCol""")
+        self.failUnlessEqual(self.cursor.fetchone(), (1, 143))
+        self.cursor.rowfactory = list
+        self.failUnlessEqual(self.cursor.fetchone(), [2, None])
+        self.cursor.rowfactory = lambda row: row[0]
+        self.failUnlessEqual(self.cursor.fetchall(), [3])
+
+    def testLazyRows(self):
+        """test fetching rows which decode their columns on access"""
+        sql = """
+                select IntCol, NullableCol
+                from TestNumbers
+                order by IntCol"""
+        self.cursor.execute(sql)
+        expectedRows = self.cursor.fetchall()
+        self.cursor.arraysize = 4
+        self.cursor.lazyrows = True
+        self.cursor.execute(sql)
+        row = self.cursor.fetchone()
+        rows = self.cursor.fetchmany(5)
+        rows.extend(self.cursor.fetchall())
+        self.failUnlessEqual(row, expectedRows[0])
+        self.failUnlessEqual(row["NULLABLECOL"], 143)
+        self.failUnlessEqual(row["IntCol"], 1)
+        self.failUnlessEqual(rows[4][-1], expectedRows[5][1])
+        self.failUnlessEqual(rows, expectedRows[1:])
+        intCol, nullableCol = rows[0]
+        self.failUnlessEqual((intCol, nullableCol), expectedRows[1])
+        self.failUnless(rows[1] > rows[0] >= expectedRows[1])
+        self.failUnless(rows[0] <= rows[0] < rows[1])
+        self.failUnless(expectedRows[2] > rows[0])
+        self.failUnlessEqual(sorted(reversed(rows)), expectedRows[1:])
+        self.failUnlessRaises(KeyError, row.__getitem__, "NoSuchCol")
+        self.failUnless(isinstance(row, tuple))
+        self.failUnlessEqual((0,) + row, (0,) + expectedRows[0])
+        self.failUnlessEqual(row + (0,), expectedRows[0] + (0,))
+        self.failUnlessEqual(row * 2, expectedRows[0] * 2)
+        self.failUnlessEqual(2 * row, expectedRows[0] * 2)
+        pickledRow = pickle.loads(pickle.dumps(row, 2))
+        self.failUnlessEqual(type(pickledRow), tuple)
+        self.failUnlessEqual(pickledRow, expectedRows[0])
+        self.failUnlessEqual(type(copy.copy(row)), tuple)
+        self.failUnlessEqual(copy.deepcopy(rows[0]), expectedRows[1])
+
+    def testFetchColumnBatches(self):
+        """test fetching the rows of a query as batches of columns"""
+        self.cursor.arraysize = 4
+        self.cursor.execute("""
+                select IntCol, NullableCol
+                from TestNumbers
+                order by IntCol""")
+        self.failUnlessEqual(self.cursor.fetchone(), (1, 143))
+        batches = list(self.cursor.fetch_column_batches())
+        self.failUnlessEqual([len(b[0]) for b in batches], [3, 4, 2])
+        intCol = sum([b[0] for b in batches], [])
+        nullableCol = sum([b[1] for b in batches], [])
+        self.failUnlessEqual(intCol, range(2, 11))
+        self.failUnlessEqual(nullableCol,
+                [i % 2 and 143L ** i or None for i in range(2, 11)])
+        self.failUnlessEqual(self.cursor.rowcount, 10)
+        self.failUnlessEqual(self.cursor.fetchall(), [])
+
+    def testPrefetch(self):
+        """test fetching with different prefetch settings"""
+        self.failUnlessEqual(self.cursor.prefetchrows, None)
+        self.failUnlessEqual(self.cursor.prefetchmemory, None)
+        self.connection.prefetchrows = 2
+        self.connection.prefetchmemory = 1024
+        cursor = self.connection.cursor()
+        self.failUnlessEqual(cursor.prefetchrows, 2)
+        self.failUnlessEqual(cursor.prefetchmemory, 1024)
+        self.cursor.execute("select IntCol from TestNumbers order by IntCol")
+        expectedRows = self.cursor.fetchall()
+        for prefetchRows, prefetchMemory in ((0, None), (1, None), (20, 0), (None, 100)):
+            cursor.prefetchrows = prefetchRows
+            cursor.prefetchmemory = prefetchMemory
+            cursor.execute("select IntCol from TestNumbers order by IntCol")
+            self.failUnlessEqual(cursor.fetchall(), expectedRows)
+
+    def testAdaptiveFetch(self):
+        """test fetching with the number of rows adapted to a memory budget"""
+        self.cursor.execute("select IntCol from TestNumbers order by IntCol")
+        expectedRows = self.cursor.fetchall()
+        cursor = self.connection.cursor()
+        cursor.adaptivefetch = True
+        cursor.execute("select IntCol from TestNumbers order by IntCol")
+        self.failUnless(cursor.fetchvars[0].allocelems > cursor.arraysize,
+                "variables not defined for the memory budget")
+        self.failUnlessEqual(cursor.fetchall(), expectedRows)
+        # a budget of two rows: each takes the buffer and a 2 byte indicator
+        rowSize = cursor.fetchvars[0].bufferSize + 2
+        self.cursor.adaptivefetch = True
+        self.cursor.fetchmemorybudget = rowSize * 2
+        self.cursor.execute("""
+                select IntCol
+                from TestNumbers
+                order by IntCol""")
+        batches = list(self.cursor.fetch_column_batches())
+        self.failUnlessEqual(max([len(b[0]) for b in batches]), 2)
+        self.failUnlessEqual([(v,) for b in batches for v in b[0]],
+                expectedRows)
+
+    def testBackgroundFetch(self):
+        """test fetching the rows of a query in the background"""
+        statement = "select IntCol, NullableCol from TestNumbers " \
+                "order by IntCol"
+        self.cursor.execute(statement)
+        expectedRows = self.cursor.fetchall()
+        connection = cx_Oracle.connect(USERNAME, PASSWORD, TNSENTRY,
+                threaded = True)
+        cursor = connection.cursor()
+        cursor.arraysize = 3
+        cursor.backgroundfetch = True
+        cursor.execute(statement)
+        self.failUnlessEqual(cursor.fetchone(), expectedRows[0])
+        self.failIf(cursor.background_fetch is None,
+                "rows not fetched in the background")
+        self.failIf(cursor.background_fetch.thread is None,
+                "next batch not being fetched")
+        self.failUnlessEqual(cursor.fetchmany(4), expectedRows[1:5])
+        self.failUnlessEqual(cursor.fetchall(), expectedRows[5:])
+        self.failUnlessEqual(cursor.rowcount, 10)
+        cursor.execute(statement)
+        self.failUnlessEqual(cursor.fetchmany(2), expectedRows[:2])
+        cursor.execute(statement)
+        self.failUnlessEqual(cursor.fetchall(), expectedRows)
+        connection.close()
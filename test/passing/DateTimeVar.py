@@ -226,3 +226,18 @@ class TestDateTimeVar(BaseTestCase):
         self.failUnlessEqual(self.cursor.fetchone(), self.dataByKey[4])
         self.failUnlessEqual(self.cursor.fetchone(), None)
 
+
+    def testFetchRepeatedDates(self):
+        "test that fetching many repeated dates returns the correct results"
+        self.cursor.arraysize = 7
+        self.cursor.execute("""
+                select
+                  to_date('2002-12-09', 'YYYY-MM-DD') + mod(level, 5),
+                  to_date('1999-12-31 23:59:59', 'YYYY-MM-DD HH24:MI:SS')
+                from dual
+                connect by level <= 50""")
+        expected = [(datetime.datetime(2002, 12, 9 + i % 5),
+                datetime.datetime(1999, 12, 31, 23, 59, 59))
+                for i in range(1, 51)]
+        self.failUnlessEqual(self.cursor.fetchmany(3), expected[:3])
+        self.failUnlessEqual(self.cursor.fetchall(), expected[3:])
@@ -135,3 +135,21 @@ class TestLobVar(BaseTestCase):
         rows = self.cursor.fetchall()
         self.failUnlessRaises(cx_Oracle.ProgrammingError, rows[1][0].read)
 
+
+    def testAdaptiveFetch(self):
+        "test fetching CLOBs with the fetches sized by a memory budget"
+        self.cursor.execute("truncate table TestCLOBs")
+        for i in range(1, 8):
+            self.cursor.execute("""
+                    insert into TestCLOBs (IntCol, CLOBCol)
+                    values (:1, :2)""", [i, chr(ord('A') + i) * i])
+        self.connection.commit()
+        cursor = self.connection.cursor()
+        cursor.arraysize = 3
+        cursor.adaptivefetch = True
+        cursor.execute("select IntCol, CLOBCol from TestCLOBs order by IntCol")
+        self.failUnless(cursor.fetchvars[1].allocelems <= cursor.arraysize,
+                "LOB variables defined for more rows than arraysize")
+        values = [(i, lob.read()) for i, lob in cursor]
+        self.failUnlessEqual(values,
+                [(i, chr(ord('A') + i) * i) for i in range(1, 8)])
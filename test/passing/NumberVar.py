@@ -269,3 +269,109 @@ class TestNumberVar(BaseTestCase):
         result, = self.cursor.fetchone()
         self.failUnlessEqual(result, 1.25)
 
+    def testDecodedNumbersMatchOracleText(self):
+        "test that numbers decoded in Python match Oracle's own conversion"
+        sql = """
+                select
+                  power(-1, level) * power(7, mod(level, 45)) /
+                      power(10, mod(level * 13, 61)),
+                  power(-1, level) * level / 7,
+                  power(-1, level) * power(13, mod(level, 35)),
+                  case when mod(level, 5) = 0 then null else level end
+                from dual
+                connect by level <= 5000"""
+        self.cursor.execute(sql)
+        rows = self.cursor.fetchall()
+        textCursor = self.connection.cursor()
+        textCursor.numbersAsStrings = True
+        textCursor.execute(sql)
+        textRows = textCursor.fetchall()
+        self.failUnlessEqual(len(rows), len(textRows))
+        for row, textRow in zip(rows, textRows):
+            for value, text in zip(row, textRow):
+                if text is None:
+                    self.failUnlessEqual(value, None)
+                elif "." in text:
+                    self.failUnlessEqual(value, float(text))
+                else:
+                    self.failUnlessEqual(value, int(text))
+        self.cursor.execute(sql)
+        columns = zip(*rows)
+        for batch in self.cursor.fetch_column_batches():
+            for i, values in enumerate(batch):
+                self.failUnlessEqual(values, list(columns[i][:len(values)]))
+                columns[i] = columns[i][len(values):]
+
+    def testEncodedNumbersMatchOracleText(self):
+        "test that numbers encoded in Python match Oracle's own conversion"
+        values = [0, 1, -1, 100, -100, 2 ** 62, -(2 ** 62), 10 ** 40 + 7,
+                -(10 ** 125), True, False, 0.1, -0.1, 1.5e-7, 1e125,
+                -3.25e-100, decimal.Decimal("1.23"),
+                decimal.Decimal("-0.000000000000000000000000000001"),
+                decimal.Decimal("123456789012345678901234567890123456.78")]
+        values.extend(n * 7.0 / 3 for n in range(-50, 50))
+        values.extend(n ** 9 for n in range(-50, 50))
+        texts = [repr(float(v)) if isinstance(v, float) else str(int(v))
+                if isinstance(v, bool) else str(v) for v in values]
+        sql = """
+                begin
+                  if :value != to_number(:text) then
+                    raise_application_error(-20000, 'mismatch: ' || :text);
+                  end if;
+                end;"""
+        for value, text in zip(values, texts):
+            self.cursor.execute(sql, value = value, text = text)
+        self.cursor.executemany_columns(sql,
+                dict(value = values, text = texts))
+
+    def testNativeFloat(self):
+        "test fetching and binding native floats"
+        self.cursor.execute("""
+                select
+                  cast(1.25 as binary_double),
+                  cast(-0.5 as binary_float),
+                  cast(null as binary_double)
+                from dual""")
+        self.failUnlessEqual(self.cursor.fetchall(), [(1.25, -0.5, None)])
+        var = self.cursor.var(cx_Oracle.NATIVE_FLOAT)
+        var.setvalue(0, 2.5)
+        self.cursor.execute("""
+                begin
+                  :value := :value * 2;
+                end;""",
+                value = var)
+        self.failUnlessEqual(var.getvalue(), 5.0)
+        self.failUnlessRaises(TypeError, var.setvalue, 0, 5)
+
+    def testNumbersAsNativeFloats(self):
+        "test fetching numbers with fractions as native floats"
+        self.cursor.execute("""
+                select IntCol, NumberCol, FloatCol
+                from TestNumbers
+                order by IntCol""")
+        expectedRows = self.cursor.fetchall()
+        cursor = self.connection.cursor()
+        cursor.numbersAsNativeFloats = True
+        cursor.execute("""
+                select IntCol, NumberCol, FloatCol
+                from TestNumbers
+                order by IntCol""")
+        for row, expectedRow in zip(cursor.fetchall(), expectedRows):
+            intCol, numberCol, floatCol = row
+            self.failUnless(isinstance(intCol, int))
+            self.failUnless(isinstance(numberCol, float))
+            self.failUnlessEqual(row, expectedRow)
+
+    def testFetchNativeIntegers(self):
+        "test fetching integers that fit in 64 bits and integers that do not"
+        self.cursor.execute("""
+                select
+                  cast(999999999999999999 as number(18)),
+                  cast(-999999999999999999 as number(18)),
+                  cast(null as number(18)),
+                  cast(-7 as number(1)),
+                  cast(99999999999999999999 as number(20))
+                from dual""")
+        self.failUnlessEqual(self.cursor.fetchall(),
+                [(999999999999999999, -999999999999999999, None, -7,
+                  99999999999999999999L)])
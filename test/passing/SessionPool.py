@@ -91,6 +91,20 @@ class TestConnection(TestCase):
         count, = cursor.fetchone()
         self.failUnlessEqual(count, 0)
 
+    def testDrop(self):
+        "connection is dropped from the pool instead of kept for reuse"
+        pool = cx_Oracle.SessionPool(USERNAME, PASSWORD, TNSENTRY, 1, 8, 3)
+        connection = pool.acquire()
+        self.failUnlessEqual(pool.busy, 1, "busy not 1 after acquire")
+        pool.drop(connection)
+        self.failUnlessEqual(pool.busy, 0, "busy not 0 after drop")
+        self.failUnlessRaises(cx_Oracle.InterfaceError, connection.rollback)
+        otherPool = cx_Oracle.SessionPool(USERNAME, PASSWORD, TNSENTRY, 1, 8,
+                3)
+        connection = otherPool.acquire()
+        self.failUnlessRaises(cx_Oracle.ProgrammingError, pool.release,
+                connection)
+
     def testThreading(self):
         """test session pool to database with multiple threads"""
         self.pool = cx_Oracle.SessionPool(USERNAME, PASSWORD, TNSENTRY, 5, 20,
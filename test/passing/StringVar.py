@@ -235,6 +235,24 @@ class TestStringVar(BaseTestCase):
                 "output does not match: in was %d, out was %d" % \
                 (len(inString), len(outString)))
 
+    def testBindStringColumns(self):
+        "test binding columns of strings of growing sizes"
+        lengths = [1, 5, None, 20, 0, 300, 2000, 3]
+        values = [n is not None and "X" * n or None for n in lengths]
+        sql = """
+                begin
+                  if nvl(:value, '-') != nvl(rpad('X', :length, 'X'), '-') then
+                    raise_application_error(-20000, 'mismatch');
+                  end if;
+                end;"""
+        self.cursor.executemany_columns(sql,
+                dict(value = values, length = lengths))
+        values = [v is not None and unicode(v) or None for v in values]
+        self.cursor.executemany_columns(sql,
+                dict(value = values, length = lengths))
+        rows = [dict(value = v, length = n) for v, n in zip(values, lengths)]
+        self.cursor.executemany(sql, rows)
+
     def testStringMaximumReached(self):
         "test that an error is raised when maximum string length exceeded"
         var = self.cursor.setinputsizes(test = 100)["test"]
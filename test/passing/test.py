@@ -18,6 +18,8 @@ else:
     moduleNames = [
             "Connection",
             "uConnection",
+            "ConnectionPool",
+            "AsyncConnection",
             "Cursor",
             "uCursor",
             "CursorVar",